@@ -39,6 +39,8 @@ LM_FIELDS_TO_VALIDATE_IOGO = [
     "Active Bucket Counter: Bucket 3",
 ]
 
+BLOCK_SIZE_PATTERN = re.compile(r"\d+MB")
+
 
 class LatencyMonitor:
     """
@@ -309,23 +311,29 @@ class LatencyMonitor:
                     result_file = path.replace("lm", "lmparser")
                     validated_logs.extend([path, result_file])
                     file = FileActions.read_data(path, host=self.host)
+                    if workload == "ioT6":
+                        lm_fields_to_validate = LM_FIELDS_TO_VALIDATE_IOGO
+                    elif self.dc_lm_validation:
+                        lm_fields_to_validate = LM_FIELDS_TO_VALIDATE_DC
+                    else:
+                        lm_fields_to_validate = LM_FIELDS_TO_VALIDATE_Hi5
                     if self.ocp_lm_commands:
                         output_dict = json.loads(file)
                     else:
-                        byteregex = r"(?<!\S)[0-9a-fA-F]{2}(?!\S)"
-                        bytelist = re.findall(byteregex, file)
+                        logdata = self.lmparser.hexdump_to_buffer(file)
 
-                        output_text = self.lmparser.extract_humanreadable_output(
-                            self.lmparser.OCP2_SCHEMA, bytelist
+                        output_text, output_dict = (
+                            self.lmparser.extract_humanreadable_and_json_output(
+                                self.lmparser.OCP2_SCHEMA,
+                                logdata,
+                                json_fields=lm_fields_to_validate,
+                            )
                         )
                         FileActions.write_data(
                             path=result_file, contents=output_text, host=self.host
                         )
-                        output_dict = self.lmparser.extract_json_output(
-                            self.lmparser.OCP2_SCHEMA, bytelist
-                        )
                     if workload == "ioT6":
-                        match = re.search(r"\d+MB", path)
+                        match = BLOCK_SIZE_PATTERN.search(path)
                         if match:
                             block_size = match.group()
                         else:
@@ -335,17 +343,13 @@ class LatencyMonitor:
                         self.validate_results(
                             output_dict,
                             drive,
-                            LM_FIELDS_TO_VALIDATE_IOGO,
+                            lm_fields_to_validate,
                             workload,
                             block_size,
                         )
-                    elif self.dc_lm_validation:
-                        self.validate_results(  # noqa
-                            output_dict, drive, LM_FIELDS_TO_VALIDATE_DC
-                        )
                     else:
                         self.validate_results(  # noqa
-                            output_dict, drive, LM_FIELDS_TO_VALIDATE_Hi5
+                            output_dict, drive, lm_fields_to_validate
                         )
                     break
         if workload == "ioT6":
@@ -3,10 +3,341 @@
 # pyre-unsafe
 
 import argparse
+import functools
 import json
-import re
+import mmap
+import struct
+import sys
 from datetime import datetime
-from typing import Dict, List, Union
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+BytesLike = Union[bytes, bytearray, memoryview, mmap.mmap]
+# Raw log bytes, or a list of hex bytes such as ['07','d7','a2'] from a hexdump
+LogData = Union[BytesLike, List[str]]
+
+# Little endian struct format codes for byte level field sizes
+_STRUCT_CODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+# Struct decoders shared between identical subschemas, keyed by format string
+_STRUCTS: Dict[str, struct.Struct] = {}
+# The timestamp occupies the low 48 bits of the 8 byte timestamp data structure
+_TIMESTAMP_MASK = (1 << 48) - 1
+_TIMESTAMP_STRUCTURE_UNSET = (1 << 64) - 1
+# Formats computed from the integer value of a field, keyed by format type
+_HUMANREADABLE_FORMATTERS = {
+    "5min": lambda data: f"{data * 5} min",
+    "5ms+5": lambda data: f"{data * 5 + 5} ms",
+    "100ms": lambda data: f"{data * 100} ms",
+    "1ms": lambda data: f"{data} ms",
+    "decimal": str,
+}
+_JSON_FORMATTERS = {
+    "decimal": int,
+    "decimal*5": lambda data: data * 5,
+    "decimal*5+5": lambda data: data * 5 + 5,
+    "decimal*100": lambda data: data * 100,
+}
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+# Human-readable output line prefixes for the common schema nesting depths
+_OUTPUT_PREFIXES = tuple(
+    "\t" * depth + ("-" * depth + " " if depth else "") for depth in range(8)
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_milliseconds(milliseconds: int) -> str:
+    """
+    Formats milliseconds since the epoch as a GMT date and time
+    Cached, as the latency stamps of a log and of consecutive logs often repeat
+    """
+    datetimestring = datetime.utcfromtimestamp(milliseconds / 1000).isoformat(
+        sep=" ", timespec="milliseconds"
+    )
+    return f"{datetimestring} GMT"
+
+
+# Timestamp data structure for get features as specified in NVM Express Revision 1.4
+_TIMESTAMP_SUBSCHEMA = {
+    "schema_level": "bit",
+    "instructions": [
+        {
+            "field": "Timestamp",
+            "offset": 0,
+            "size": 48,
+            "format": "timestamp",
+        },
+        {
+            "field": "Timestamp Origin",
+            "offset": 49,
+            "size": 3,
+        },
+        {
+            "field": "Synch",
+            "offset": 48,
+            "size": 1,
+        },
+        {
+            "field": "Reserved",
+            "offset": 52,
+            "size": 12,
+            "verbose_only": True,
+        },
+    ],
+}
+
+_BUCKET_COUNTER_SUBSCHEMA = {
+    "schema_level": "byte",
+    "instructions": [
+        {
+            "field": "Read Command Counter",
+            "json_field": "Read",
+            "offset": 12,
+            "size": 4,
+            "format": "decimal",
+            "json_format": "decimal",
+        },
+        {
+            "field": "Write Command Counter",
+            "json_field": "Write",
+            "offset": 8,
+            "size": 4,
+            "format": "decimal",
+            "json_format": "decimal",
+        },
+        {
+            "field": "De-Allocate/TRIM Command Counter",
+            "json_field": "Trim",
+            "offset": 4,
+            "size": 4,
+            "format": "decimal",
+            "json_format": "decimal",
+        },
+        {
+            "field": "Reserved",
+            "offset": 0,
+            "size": 4,
+            "verbose_only": True,
+        },
+    ],
+}
+
+_LATENCY_STAMP_SUBSCHEMA = {
+    "schema_level": "byte",
+    "instructions": [
+        {
+            "field": "Read",
+            "json_field": "Read",
+            "offset": 16,
+            "size": 8,
+            "json_format": "timestamp",
+            "subschema": _TIMESTAMP_SUBSCHEMA,
+        },
+        {
+            "field": "Write",
+            "json_field": "Write",
+            "offset": 8,
+            "size": 8,
+            "json_format": "timestamp",
+            "subschema": _TIMESTAMP_SUBSCHEMA,
+        },
+        {
+            "field": "De-Allocate/TRIM",
+            "json_field": "Trim",
+            "offset": 0,
+            "size": 8,
+            "json_format": "timestamp",
+            "subschema": _TIMESTAMP_SUBSCHEMA,
+        },
+    ],
+}
+
+_MEASURED_LATENCY_SUBSCHEMA = {
+    "schema_level": "byte",
+    "instructions": [
+        {
+            "field": "Read",
+            "json_field": "Read",
+            "offset": 4,
+            "size": 2,
+            "format": "1ms",
+            "json_format": "decimal",
+        },
+        {
+            "field": "Write",
+            "json_field": "Write",
+            "offset": 2,
+            "size": 2,
+            "format": "1ms",
+            "json_format": "decimal",
+        },
+        {
+            "field": "De-Allocate/TRIM",
+            "json_field": "Trim",
+            "offset": 0,
+            "size": 2,
+            "format": "1ms",
+            "json_format": "decimal",
+        },
+    ],
+}
+
+# Bit per bucket and command type, shared by the stamp units and trigger fields
+_BUCKET_BITMAP_SUBSCHEMA = {
+    "schema_level": "bit",
+    "instructions": [
+        {
+            "field": "Reserved",
+            "offset": 12,
+            "size": 4,
+            "verbose_only": True,
+        },
+        *(
+            {
+                "field": f"Bucket {bucket} {command}",
+                "offset": bucket * 3 + bit,
+                "size": 1,
+            }
+            for bucket in range(4)
+            for bit, command in enumerate(["Read", "Write", "Deallocate/TRIM"])
+        ),
+    ],
+}
+
+
+def _latency_configuration_block(bucket: int, requirement_id: str) -> dict:
+    """Returns the Active Latency Configuration instruction of a bucket"""
+    return {
+        "field": f"Active Latency Configuration - Bucket {bucket}",
+        "json_field": f"Active Latency Mode: Bucket {bucket}",
+        "requirement_id": requirement_id,
+        "offset": 10,
+        "size": 2,
+        "subschema": {
+            "schema_level": "bit",
+            "instructions": [
+                {
+                    "field": "Read",
+                    "json_field": "Read",
+                    "offset": bucket * 3,
+                    "size": 1,
+                    "json_format": "decimal",
+                },
+                {
+                    "field": "Write",
+                    "json_field": "Write",
+                    "offset": bucket * 3 + 1,
+                    "size": 1,
+                    "json_format": "decimal",
+                },
+                {
+                    "field": "Deallocate/TRIM",
+                    "json_field": "Trim",
+                    "offset": bucket * 3 + 2,
+                    "size": 1,
+                    "json_format": "decimal",
+                },
+            ],
+        },
+    }
+
+
+def _bucket_counter_block(
+    kind: str, bucket: int, offset: int, requirement_id: str
+) -> dict:
+    """Returns the Active or Static Bucket Counter instruction of a bucket"""
+    return {
+        "field": f"{kind} Bucket Counter {bucket}",
+        "json_field": f"{kind} Bucket Counter: Bucket {bucket}",
+        "requirement_id": requirement_id,
+        "offset": offset,
+        "size": 16,
+        "subschema": _BUCKET_COUNTER_SUBSCHEMA,
+    }
+
+
+def _latency_stamp_block(
+    kind: str, bucket: int, offset: int, requirement_id: str
+) -> dict:
+    """Returns the Active or Static Latency Stamp instruction of a bucket"""
+    return {
+        "field": f"{kind} Latency Stamp - Bucket {bucket}",
+        "json_field": f"{kind} Latency Time Stamp: Bucket {bucket}",
+        "requirement_id": requirement_id,
+        "offset": offset,
+        "size": 24,
+        "subschema": _LATENCY_STAMP_SUBSCHEMA,
+    }
+
+
+def _measured_latency_block(
+    kind: str, bucket: int, offset: int, requirement_id: str
+) -> dict:
+    """Returns the Active or Static Measured Latency instruction of a bucket"""
+    return {
+        "field": f"{kind} Measured Latency - Bucket {bucket}",
+        "json_field": f"{kind} Measured Latency: Bucket {bucket}",
+        "requirement_id": requirement_id,
+        "offset": offset,
+        "size": 6,
+        "subschema": _MEASURED_LATENCY_SUBSCHEMA,
+    }
+
+
+class _CompiledInstruction(NamedTuple):
+    """
+    Schema instruction with its optional keys resolved to defaults
+    mask holds the size bits of a field so bit level fields are extracted as
+    (value >> offset) & mask
+    label and heading are the human-readable output text preceding the value
+    of the field and introducing its non-verbose subschema respectively
+    """
+
+    field: str
+    label: str
+    heading: str
+    json_field: str
+    format_type: str
+    json_format: str
+    data_type: str
+    offset: int
+    size: int
+    mask: int
+    verbose_only: bool
+    subschema: Optional["_CompiledSchema"]
+
+
+class _CompiledSchema(NamedTuple):
+    """
+    Schema compiled for parsing
+    decode_order lists the instruction indices sorted by offset, so fields are
+    read from the buffer sequentially while output keeps the declared order
+    visible_mask and json_mask have bit i set when instruction i is output in
+    the non-verbose and JSON output respectively
+    """
+
+    schema_level: str
+    instructions: Tuple[_CompiledInstruction, ...]
+    decode_order: Tuple[int, ...]
+    decoder: Optional[struct.Struct]
+    visible_mask: int
+    json_mask: int
+
+
+class ParsedField(NamedTuple):
+    """Decoded value of a schema instruction and the parsed fields of its subschema"""
+
+    instruction: _CompiledInstruction
+    value: int
+    subfields: List["ParsedField"]
 
 
 class LatencyMonitorLogParser:
@@ -93,1756 +424,129 @@ class LatencyMonitorLogParser:
                 "json_format": "decimal*5+5",
             },
             {
-                "field": "Active Threshold C",
-                "json_field": "Active Threshold C",
-                "requirement_id": "LMDATA-7",
-                "offset": 8,
-                "size": 1,
-                "format": "5ms+5",
-                "json_format": "decimal*5+5",
-            },
-            {
-                "field": "Active Threshold D",
-                "json_field": "Active Threshold D",
-                "requirement_id": "LMDATA-8",
-                "offset": 9,
-                "size": 1,
-                "format": "5ms+5",
-                "json_format": "decimal*5+5",
-            },
-            {
-                "field": "Active Latency Configuration",
-                "requirement_id": "LMDATA-9a",
-                "offset": 10,
-                "size": 2,
-                "verbose_only": True,
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [{"field": "Reserved", "offset": 12, "size": 4}],
-                },
-            },
-            {
-                "field": "Active Latency Configuration - Bucket 0",
-                "json_field": "Active Latency Mode: Bucket 0",
-                "requirement_id": "LMDATA-9b",
-                "offset": 10,
-                "size": 2,
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 0,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 1,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Deallocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 2,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Configuration - Bucket 1",
-                "json_field": "Active Latency Mode: Bucket 1",
-                "requirement_id": "LMDATA-9c",
-                "offset": 10,
-                "size": 2,
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 3,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 4,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Deallocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 5,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Configuration - Bucket 2",
-                "json_field": "Active Latency Mode: Bucket 2",
-                "requirement_id": "LMDATA-9d",
-                "offset": 10,
-                "size": 2,
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 6,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 7,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Deallocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 8,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Configuration - Bucket 3",
-                "json_field": "Active Latency Mode: Bucket 3",
-                "requirement_id": "LMDATA-9e",
-                "offset": 10,
-                "size": 2,
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 9,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 10,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Deallocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 11,
-                            "size": 1,
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Minimum Window",
-                "json_field": "Active Latency Minimum Window",
-                "requirement_id": "LMDATA-10",
-                "offset": 12,
-                "size": 1,
-                "format": "100ms",
-                "json_format": "decimal*100",
-            },
-            {
-                "field": "Reserved",
-                "requirement_id": "LMDATA-11",
-                "offset": 13,
-                "size": 19,
-                "verbose_only": True,
-            },
-            {
-                "field": "Active Bucket Counter 0",
-                "json_field": "Active Bucket Counter: Bucket 0",
-                "requirement_id": "LMDATA-12",
-                "offset": 32,
-                "size": 16,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read Command Counter",
-                            "json_field": "Read",
-                            "offset": 12,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write Command Counter",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM Command Counter",
-                            "json_field": "Trim",
-                            "offset": 4,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 0,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Bucket Counter 1",
-                "json_field": "Active Bucket Counter: Bucket 1",
-                "requirement_id": "LMDATA-13",
-                "offset": 48,
-                "size": 16,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read Command Counter",
-                            "json_field": "Read",
-                            "offset": 12,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write Command Counter",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM Command Counter",
-                            "json_field": "Trim",
-                            "offset": 4,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 0,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Bucket Counter 2",
-                "json_field": "Active Bucket Counter: Bucket 2",
-                "requirement_id": "LMDATA-14",
-                "offset": 64,
-                "size": 16,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read Command Counter",
-                            "json_field": "Read",
-                            "offset": 12,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write Command Counter",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM Command Counter",
-                            "json_field": "Trim",
-                            "offset": 4,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 0,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Bucket Counter 3",
-                "json_field": "Active Bucket Counter: Bucket 3",
-                "requirement_id": "LMDATA-15",
-                "offset": 80,
-                "size": 16,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read Command Counter",
-                            "json_field": "Read",
-                            "offset": 12,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write Command Counter",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM Command Counter",
-                            "json_field": "Trim",
-                            "offset": 4,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 0,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Stamp - Bucket 0",
-                "json_field": "Active Latency Time Stamp: Bucket 0",
-                "requirement_id": "LMDATA-16a",
-                "offset": 168,
-                "size": 24,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 16,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Stamp - Bucket 1",
-                "json_field": "Active Latency Time Stamp: Bucket 1",
-                "requirement_id": "LMDATA-16b",
-                "offset": 144,
-                "size": 24,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 16,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Stamp - Bucket 2",
-                "json_field": "Active Latency Time Stamp: Bucket 2",
-                "requirement_id": "LMDATA-16c",
-                "offset": 120,
-                "size": 24,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 16,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Stamp - Bucket 3",
-                "json_field": "Active Latency Time Stamp: Bucket 3",
-                "requirement_id": "LMDATA-16d",
-                "offset": 96,
-                "size": 24,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 16,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Measured Latency - Bucket 0",
-                "json_field": "Active Measured Latency: Bucket 0",
-                "requirement_id": "LMDATA-17a",
-                "offset": 210,
-                "size": 6,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 4,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 2,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Measured Latency - Bucket 1",
-                "json_field": "Active Measured Latency: Bucket 1",
-                "requirement_id": "LMDATA-17b",
-                "offset": 204,
-                "size": 6,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 4,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 2,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Measured Latency - Bucket 2",
-                "json_field": "Active Measured Latency: Bucket 2",
-                "requirement_id": "LMDATA-17c",
-                "offset": 198,
-                "size": 6,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 4,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 2,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Measured Latency - Bucket 3",
-                "json_field": "Active Measured Latency: Bucket 3",
-                "requirement_id": "LMDATA-17d",
-                "offset": 192,
-                "size": 6,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 4,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 2,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Active Latency Stamp Units",
-                "json_field": "Active Latency Stamp Units",
-                "requirement_id": "LMDATA-18",
-                "offset": 216,
-                "size": 2,
-                "json_format": "decimal",
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Reserved",
-                            "offset": 12,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                        {"field": "Bucket 0 Read", "offset": 0, "size": 1},
-                        {"field": "Bucket 0 Write", "offset": 1, "size": 1},
-                        {"field": "Bucket 0 Deallocate/TRIM", "offset": 2, "size": 1},
-                        {"field": "Bucket 1 Read", "offset": 3, "size": 1},
-                        {"field": "Bucket 1 Write", "offset": 4, "size": 1},
-                        {"field": "Bucket 1 Deallocate/TRIM", "offset": 5, "size": 1},
-                        {"field": "Bucket 2 Read", "offset": 6, "size": 1},
-                        {"field": "Bucket 2 Write", "offset": 7, "size": 1},
-                        {"field": "Bucket 2 Deallocate/TRIM", "offset": 8, "size": 1},
-                        {"field": "Bucket 3 Read", "offset": 9, "size": 1},
-                        {"field": "Bucket 3 Write", "offset": 10, "size": 1},
-                        {"field": "Bucket 3 Deallocate/TRIM", "offset": 11, "size": 1},
-                    ],
-                },
-            },
-            {
-                "field": "Reserved",
-                "requirement_id": "LMDATA-19",
-                "offset": 218,
-                "size": 22,
-                "verbose_only": True,
-            },
-            {
-                "field": "Static Bucket Counter 0",
-                "json_field": "Static Bucket Counter: Bucket 0",
-                "requirement_id": "LMDATA-20",
-                "offset": 240,
-                "size": 16,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read Command Counter",
-                            "json_field": "Read",
-                            "offset": 12,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write Command Counter",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM Command Counter",
-                            "json_field": "Trim",
-                            "offset": 4,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 0,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Static Bucket Counter 1",
-                "json_field": "Static Bucket Counter: Bucket 1",
-                "requirement_id": "LMDATA-21",
-                "offset": 256,
-                "size": 16,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read Command Counter",
-                            "json_field": "Read",
-                            "offset": 12,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write Command Counter",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM Command Counter",
-                            "json_field": "Trim",
-                            "offset": 4,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 0,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Static Bucket Counter 2",
-                "json_field": "Static Bucket Counter: Bucket 2",
-                "requirement_id": "LMDATA-22",
-                "offset": 272,
-                "size": 16,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read Command Counter",
-                            "json_field": "Read",
-                            "offset": 12,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write Command Counter",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM Command Counter",
-                            "json_field": "Trim",
-                            "offset": 4,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 0,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Static Bucket Counter 3",
-                "json_field": "Static Bucket Counter: Bucket 3",
-                "requirement_id": "LMDATA-23",
-                "offset": 288,
-                "size": 16,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read Command Counter",
-                            "json_field": "Read",
-                            "offset": 12,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write Command Counter",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM Command Counter",
-                            "json_field": "Trim",
-                            "offset": 4,
-                            "size": 4,
-                            "format": "decimal",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 0,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Static Latency Stamp - Bucket 0",
-                "json_field": "Static Latency Time Stamp: Bucket 0",
-                "requirement_id": "LMDATA-24a",
-                "offset": 376,
-                "size": 24,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 16,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Static Latency Stamp - Bucket 1",
-                "json_field": "Static Latency Time Stamp: Bucket 1",
-                "requirement_id": "LMDATA-24b",
-                "offset": 352,
-                "size": 24,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 16,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                    ],
-                },
-            },
-            {
-                "field": "Static Latency Stamp - Bucket 2",
-                "json_field": "Static Latency Time Stamp: Bucket 2",
-                "requirement_id": "LMDATA-24c",
-                "offset": 328,
-                "size": 24,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 16,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                    ],
-                },
+                "field": "Active Threshold C",
+                "json_field": "Active Threshold C",
+                "requirement_id": "LMDATA-7",
+                "offset": 8,
+                "size": 1,
+                "format": "5ms+5",
+                "json_format": "decimal*5+5",
             },
             {
-                "field": "Static Latency Stamp - Bucket 3",
-                "json_field": "Static Latency Time Stamp: Bucket 3",
-                "requirement_id": "LMDATA-24d",
-                "offset": 304,
-                "size": 24,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 16,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 8,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 8,
-                            "json_format": "timestamp",
-                            "subschema": {
-                                "schema_level": "bit",
-                                "instructions": [
-                                    {
-                                        "field": "Timestamp",
-                                        "offset": 0,
-                                        "size": 48,
-                                        "format": "timestamp",
-                                    },
-                                    {
-                                        "field": "Timestamp Origin",
-                                        "offset": 49,
-                                        "size": 3,
-                                    },
-                                    {
-                                        "field": "Synch",
-                                        "offset": 48,
-                                        "size": 1,
-                                    },
-                                    {
-                                        "field": "Reserved",
-                                        "offset": 52,
-                                        "size": 12,
-                                        "verbose_only": True,
-                                    },
-                                ],
-                            },
-                        },
-                    ],
-                },
+                "field": "Active Threshold D",
+                "json_field": "Active Threshold D",
+                "requirement_id": "LMDATA-8",
+                "offset": 9,
+                "size": 1,
+                "format": "5ms+5",
+                "json_format": "decimal*5+5",
             },
             {
-                "field": "Static Measured Latency - Bucket 0",
-                "json_field": "Static Measured Latency: Bucket 0",
-                "requirement_id": "LMDATA-25a",
-                "offset": 418,
-                "size": 6,
+                "field": "Active Latency Configuration",
+                "requirement_id": "LMDATA-9a",
+                "offset": 10,
+                "size": 2,
+                "verbose_only": True,
                 "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 4,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 2,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                    ],
+                    "schema_level": "bit",
+                    "instructions": [{"field": "Reserved", "offset": 12, "size": 4}],
                 },
             },
+            *(
+                _latency_configuration_block(bucket, requirement_id)
+                for bucket, requirement_id in [
+                    (0, "LMDATA-9b"),
+                    (1, "LMDATA-9c"),
+                    (2, "LMDATA-9d"),
+                    (3, "LMDATA-9e"),
+                ]
+            ),
             {
-                "field": "Static Measured Latency - Bucket 1",
-                "json_field": "Static Measured Latency: Bucket 1",
-                "requirement_id": "LMDATA-25b",
-                "offset": 412,
-                "size": 6,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 4,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 2,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
+                "field": "Active Latency Minimum Window",
+                "json_field": "Active Latency Minimum Window",
+                "requirement_id": "LMDATA-10",
+                "offset": 12,
+                "size": 1,
+                "format": "100ms",
+                "json_format": "decimal*100",
             },
             {
-                "field": "Static Measured Latency - Bucket 2",
-                "json_field": "Static Measured Latency: Bucket 2",
-                "requirement_id": "LMDATA-25c",
-                "offset": 406,
-                "size": 6,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 4,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 2,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
+                "field": "Reserved",
+                "requirement_id": "LMDATA-11",
+                "offset": 13,
+                "size": 19,
+                "verbose_only": True,
             },
+            *(
+                _bucket_counter_block("Active", bucket, offset, requirement_id)
+                for bucket, offset, requirement_id in [
+                    (0, 32, "LMDATA-12"),
+                    (1, 48, "LMDATA-13"),
+                    (2, 64, "LMDATA-14"),
+                    (3, 80, "LMDATA-15"),
+                ]
+            ),
+            *(
+                _latency_stamp_block("Active", bucket, offset, requirement_id)
+                for bucket, offset, requirement_id in [
+                    (0, 168, "LMDATA-16a"),
+                    (1, 144, "LMDATA-16b"),
+                    (2, 120, "LMDATA-16c"),
+                    (3, 96, "LMDATA-16d"),
+                ]
+            ),
+            *(
+                _measured_latency_block("Active", bucket, offset, requirement_id)
+                for bucket, offset, requirement_id in [
+                    (0, 210, "LMDATA-17a"),
+                    (1, 204, "LMDATA-17b"),
+                    (2, 198, "LMDATA-17c"),
+                    (3, 192, "LMDATA-17d"),
+                ]
+            ),
             {
-                "field": "Static Measured Latency - Bucket 3",
-                "json_field": "Static Measured Latency: Bucket 3",
-                "requirement_id": "LMDATA-25d",
-                "offset": 400,
-                "size": 6,
-                "subschema": {
-                    "schema_level": "byte",
-                    "instructions": [
-                        {
-                            "field": "Read",
-                            "json_field": "Read",
-                            "offset": 4,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "Write",
-                            "json_field": "Write",
-                            "offset": 2,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                        {
-                            "field": "De-Allocate/TRIM",
-                            "json_field": "Trim",
-                            "offset": 0,
-                            "size": 2,
-                            "format": "1ms",
-                            "json_format": "decimal",
-                        },
-                    ],
-                },
+                "field": "Active Latency Stamp Units",
+                "json_field": "Active Latency Stamp Units",
+                "requirement_id": "LMDATA-18",
+                "offset": 216,
+                "size": 2,
+                "json_format": "decimal",
+                "subschema": _BUCKET_BITMAP_SUBSCHEMA,
+            },
+            {
+                "field": "Reserved",
+                "requirement_id": "LMDATA-19",
+                "offset": 218,
+                "size": 22,
+                "verbose_only": True,
             },
+            *(
+                _bucket_counter_block("Static", bucket, offset, requirement_id)
+                for bucket, offset, requirement_id in [
+                    (0, 240, "LMDATA-20"),
+                    (1, 256, "LMDATA-21"),
+                    (2, 272, "LMDATA-22"),
+                    (3, 288, "LMDATA-23"),
+                ]
+            ),
+            *(
+                _latency_stamp_block("Static", bucket, offset, requirement_id)
+                for bucket, offset, requirement_id in [
+                    (0, 376, "LMDATA-24a"),
+                    (1, 352, "LMDATA-24b"),
+                    (2, 328, "LMDATA-24c"),
+                    (3, 304, "LMDATA-24d"),
+                ]
+            ),
+            *(
+                _measured_latency_block("Static", bucket, offset, requirement_id)
+                for bucket, offset, requirement_id in [
+                    (0, 418, "LMDATA-25a"),
+                    (1, 412, "LMDATA-25b"),
+                    (2, 406, "LMDATA-25c"),
+                    (3, 400, "LMDATA-25d"),
+                ]
+            ),
             {
                 "field": "Static Latency Stamp Units",
                 "json_field": "Static Latency Stamp Units",
@@ -1850,34 +554,7 @@ class LatencyMonitorLogParser:
                 "offset": 424,
                 "size": 2,
                 "json_format": "decimal",
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Reserved",
-                            "offset": 12,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                        {"field": "Bucket 0 Read", "offset": 0, "size": 1},
-                        {"field": "Bucket 0 Write", "offset": 1, "size": 1},
-                        {"field": "Bucket 0 Deallocate/TRIM", "offset": 2, "size": 1},
-                        {"field": "Bucket 1 Read", "offset": 3, "size": 1},
-                        {"field": "Bucket 1 Write", "offset": 4, "size": 1},
-                        {"field": "Bucket 1 Deallocate/TRIM", "offset": 5, "size": 1},
-                        {
-                            "field": "Bucket 2 Read",
-                            "offset": 6,
-                            "size": 1,
-                            "format": "decimal",
-                        },
-                        {"field": "Bucket 2 Write", "offset": 7, "size": 1},
-                        {"field": "Bucket 2 Deallocate/TRIM", "offset": 8, "size": 1},
-                        {"field": "Bucket 3 Read", "offset": 9, "size": 1},
-                        {"field": "Bucket 3 Write", "offset": 10, "size": 1},
-                        {"field": "Bucket 3 Deallocate/TRIM", "offset": 11, "size": 1},
-                    ],
-                },
+                "subschema": _BUCKET_BITMAP_SUBSCHEMA,
             },
             {
                 "field": "Reserved",
@@ -1893,29 +570,7 @@ class LatencyMonitorLogParser:
                 "offset": 448,
                 "size": 2,
                 "json_format": "decimal",
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Reserved",
-                            "offset": 12,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                        {"field": "Bucket 0 Read", "offset": 0, "size": 1},
-                        {"field": "Bucket 0 Write", "offset": 1, "size": 1},
-                        {"field": "Bucket 0 Deallocate/TRIM", "offset": 2, "size": 1},
-                        {"field": "Bucket 1 Read", "offset": 3, "size": 1},
-                        {"field": "Bucket 1 Write", "offset": 4, "size": 1},
-                        {"field": "Bucket 1 Deallocate/TRIM", "offset": 5, "size": 1},
-                        {"field": "Bucket 2 Read", "offset": 6, "size": 1},
-                        {"field": "Bucket 2 Write", "offset": 7, "size": 1},
-                        {"field": "Bucket 2 Deallocate/TRIM", "offset": 8, "size": 1},
-                        {"field": "Bucket 3 Read", "offset": 9, "size": 1},
-                        {"field": "Bucket 3 Write", "offset": 10, "size": 1},
-                        {"field": "Bucket 3 Deallocate/TRIM", "offset": 11, "size": 1},
-                    ],
-                },
+                "subschema": _BUCKET_BITMAP_SUBSCHEMA,
             },
             {
                 "field": "Debug Log Measured Latency",
@@ -1933,33 +588,7 @@ class LatencyMonitorLogParser:
                 "offset": 452,
                 "size": 8,
                 "json_format": "timestamp",
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Timestamp",
-                            "offset": 0,
-                            "size": 48,
-                            "format": "timestamp",
-                        },
-                        {
-                            "field": "Timestamp Origin",
-                            "offset": 49,
-                            "size": 3,
-                        },
-                        {
-                            "field": "Synch",
-                            "offset": 48,
-                            "size": 1,
-                        },
-                        {
-                            "field": "Reserved",
-                            "offset": 52,
-                            "size": 12,
-                            "verbose_only": True,
-                        },
-                    ],
-                },
+                "subschema": _TIMESTAMP_SUBSCHEMA,
             },
             {
                 "field": "Debug Log Pointer",
@@ -1975,29 +604,7 @@ class LatencyMonitorLogParser:
                 "offset": 462,
                 "size": 2,
                 "json_format": "decimal",
-                "subschema": {
-                    "schema_level": "bit",
-                    "instructions": [
-                        {
-                            "field": "Reserved",
-                            "offset": 12,
-                            "size": 4,
-                            "verbose_only": True,
-                        },
-                        {"field": "Bucket 0 Read", "offset": 0, "size": 1},
-                        {"field": "Bucket 0 Write", "offset": 1, "size": 1},
-                        {"field": "Bucket 0 Deallocate/TRIM", "offset": 2, "size": 1},
-                        {"field": "Bucket 1 Read", "offset": 3, "size": 1},
-                        {"field": "Bucket 1 Write", "offset": 4, "size": 1},
-                        {"field": "Bucket 1 Deallocate/TRIM", "offset": 5, "size": 1},
-                        {"field": "Bucket 2 Read", "offset": 6, "size": 1},
-                        {"field": "Bucket 2 Write", "offset": 7, "size": 1},
-                        {"field": "Bucket 2 Deallocate/TRIM", "offset": 8, "size": 1},
-                        {"field": "Bucket 3 Read", "offset": 9, "size": 1},
-                        {"field": "Bucket 3 Write", "offset": 10, "size": 1},
-                        {"field": "Bucket 3 Deallocate/TRIM", "offset": 11, "size": 1},
-                    ],
-                },
+                "subschema": _BUCKET_BITMAP_SUBSCHEMA,
             },
             {
                 "field": "Debug Log Stamp Units",
@@ -2047,20 +654,139 @@ class LatencyMonitorLogParser:
         ],
     }
 
-    def bytelist_to_bytestring(
-        self, bytelist: List[str], little_endian: bool = True
-    ) -> str:
+    def __init__(self) -> None:
+        self._compiled_schemas: Dict[int, Tuple[dict, _CompiledSchema]] = {}
+
+    def _compile_schema(self, schema: Dict[str, Union[str, list]]) -> _CompiledSchema:
+        """Compiles the schema once and returns the cached result on later calls"""
+        cached = self._compiled_schemas.get(id(schema))
+        if cached is None:
+            # Keep a reference to the schema so its id cannot be reused
+            cached = (schema, self._build_compiled_schema(schema))
+            self._compiled_schemas[id(schema)] = cached
+        return cached[1]
+
+    def _build_compiled_schema(
+        self, schema: Dict[str, Union[str, list]]
+    ) -> _CompiledSchema:
         """
-        Converts a list of bytes into a string with respect to endian format
-        Eg: ['07','d7','a2'] in little endian returns "a2d707"
-            ['07','d7','a2'] in big endian returns "07d7a2"
+        Recursively converts a schema dictionary into a _CompiledSchema
+        Field names and formats are interned, as they repeat across subschemas,
+        and subschemas shared between instructions are compiled only once
         """
-        output = ""
-        if little_endian:
-            bytelist = list(reversed(bytelist))
-        for byte in bytelist:
-            output += byte
-        return output
+        data_type = "hexadecimal" if schema["schema_level"] == "byte" else "binary"
+        instructions = tuple(
+            _CompiledInstruction(
+                field=sys.intern(instruction.get("field", "")),
+                label=f"{instruction.get('field', '')}: ",
+                heading=f"{instruction.get('field', '')}:\n",
+                json_field=sys.intern(instruction.get("json_field", "")),
+                format_type=sys.intern(instruction.get("format", "")),
+                json_format=sys.intern(instruction.get("json_format", "")),
+                data_type=data_type,
+                offset=instruction["offset"],
+                size=instruction["size"],
+                mask=(1 << instruction["size"]) - 1,
+                verbose_only=instruction.get("verbose_only", False),
+                subschema=(
+                    self._compile_schema(instruction["subschema"])
+                    if instruction.get("subschema")
+                    else None
+                ),
+            )
+            for instruction in schema["instructions"]
+        )
+        decode_order = tuple(
+            sorted(range(len(instructions)), key=lambda i: instructions[i].offset)
+        )
+        decoder = None
+        if schema["schema_level"] == "byte":
+            decoder = self._build_struct_decoder(instructions, decode_order)
+        return _CompiledSchema(
+            schema["schema_level"],
+            instructions,
+            decode_order,
+            decoder,
+            self._instruction_mask(
+                instructions, lambda instruction: not instruction.verbose_only
+            ),
+            self._instruction_mask(
+                instructions, lambda instruction: bool(instruction.json_field)
+            ),
+        )
+
+    @staticmethod
+    def _instruction_mask(
+        instructions: Iterable[_CompiledInstruction], predicate
+    ) -> int:
+        """Bitmap with bit i set when predicate holds for instructions[i]"""
+        mask = 0
+        for index, instruction in enumerate(instructions):
+            if predicate(instruction):
+                mask |= 1 << index
+        return mask
+
+    def _build_struct_decoder(
+        self,
+        instructions: Tuple[_CompiledInstruction, ...],
+        decode_order: Tuple[int, ...],
+    ) -> Optional[struct.Struct]:
+        """
+        Returns a struct unpacking all byte level fields in decode order with one call
+        Eg: three consecutive 2 byte fields at offsets 0, 2 and 4 return Struct("<HHH")
+        Returns None when fields overlap or have sizes without a struct format code
+        """
+        struct_format = "<"
+        position = 0
+        for index in decode_order:
+            instruction = instructions[index]
+            if instruction.offset < position or instruction.size not in _STRUCT_CODES:
+                return None
+            struct_format += "x" * (instruction.offset - position)
+            struct_format += _STRUCT_CODES[instruction.size]
+            position = instruction.offset + instruction.size
+        if struct_format not in _STRUCTS:
+            _STRUCTS[struct_format] = struct.Struct(struct_format)
+        return _STRUCTS[struct_format]
+
+    def _bit_level_value(self, compiled: _CompiledSchema, buffer: BytesLike) -> int:
+        """Returns the buffer as an integer when the schema starts at bit level"""
+        if compiled.schema_level == "bit":
+            return int.from_bytes(buffer, "little")  # Assuming always little endian
+        return 0
+
+    def _decode_fields(
+        self, compiled: _CompiledSchema, buffer: BytesLike, base: int, value: int
+    ) -> List[int]:
+        """
+        Decodes the fields of a compiled schema into one integer per instruction
+        Byte level fields are read from buffer starting at base, bit level fields
+        are extracted from value. Byte fields are read in ascending offset order,
+        all fields are returned in declared order
+        """
+        instructions = compiled.instructions
+        if compiled.schema_level == "bit":
+            # Bit fields come from a single integer, so they are all extracted
+            # in one pass in declared order
+            return [
+                (value >> instruction.offset) & instruction.mask
+                for instruction in instructions
+            ]
+        fields = [0] * len(instructions)
+        if compiled.schema_level == "byte":
+            if compiled.decoder is not None:
+                decoded = compiled.decoder.unpack_from(buffer, base)
+                for index, field_value in zip(compiled.decode_order, decoded):
+                    fields[index] = field_value
+            else:
+                for index in compiled.decode_order:
+                    start = base + instructions[index].offset
+                    fields[index] = int.from_bytes(
+                        buffer[start : start + instructions[index].size], "little"
+                    )  # Assuming always little endian
+        else:
+            raise ValueError("Unrecognized schema level!")
+        return fields
 
     def datastring_to_decimal(self, data: str, data_type: str) -> int:
         """
@@ -2074,28 +800,47 @@ class LatencyMonitorLogParser:
             return int(data, 16)
         raise ValueError("Unrecognized data type for datastring to decimal conversion!")
 
+    def decimal_to_datastring(self, data: int, data_type: str, size: int) -> str:
+        """
+        Converts an integer into a zero padded binary or hexadecimal string
+        size is in bytes for hexadecimal data and in bits for binary data
+        Eg: 10671879 in hexadecimal with size 3 returns "a2d707"
+            7 in binary with size 4 returns "0111"
+        """
+        if data_type == "binary":
+            return format(data, f"0{size}b")
+        if data_type == "hexadecimal":
+            return format(data, f"0{size * 2}x")
+        raise ValueError("Unrecognized data type for decimal to datastring conversion!")
+
     def format_timestamp_output(self, data: str, data_type: str) -> str:
         """Formats timestamp based on timestamp data structure for get features as specified in NVM Express Revision 1.4"""
         if data_type == "binary":
-            if data == "1" * 48:
+            return self._format_timestamp(int(data, 2), data_type, len(data))
+        if data_type == "hexadecimal":
+            return self._format_timestamp(int(data, 16), data_type, len(data) // 2)
+        raise ValueError("Unrecognized data type for timestamp formatting!")
+
+    def _format_timestamp(self, data: int, data_type: str, size: int) -> str:
+        """
+        Formats the decoded value of a timestamp field
+        size is in bytes for hexadecimal data and in bits for binary data
+        """
+        if data_type == "binary":
+            # An unset 48 bit timestamp has all bits set
+            if size == 48 and data == _TIMESTAMP_MASK:
                 return "NA"
-            milliseconds = int(data, 2)
-            datetimestring = datetime.utcfromtimestamp(milliseconds / 1000).isoformat(
-                sep=" ", timespec="milliseconds"
-            )
-            return f"{datetimestring} GMT"
+            return self.format_milliseconds(data)
         if data_type == "hexadecimal":
-            if data == "f" * 16:
+            if data == _TIMESTAMP_STRUCTURE_UNSET:
                 return "NA"
-            binarydata = bin(int(data, 16))[2:].zfill(len(data) * 4)
-            timestamp = binarydata[16:64]
-            milliseconds = int(timestamp, 2)
-            datetimestring = datetime.utcfromtimestamp(milliseconds / 1000).isoformat(
-                sep=" ", timespec="milliseconds"
-            )
-            return f"{datetimestring} GMT"
+            return self.format_milliseconds(data & _TIMESTAMP_MASK)
         raise ValueError("Unrecognized data type for timestamp formatting!")
 
+    def format_milliseconds(self, milliseconds: int) -> str:
+        """Formats milliseconds since the epoch as a GMT date and time"""
+        return _format_milliseconds(milliseconds)
+
     def format_humanreadable_output_prefix(self, depth: int) -> str:
         """
         Formats and returns output line prefix for field based on its depth in the schema
@@ -2103,181 +848,304 @@ class LatencyMonitorLogParser:
             returns "\t- " for depth 1, which is the first level of nesting/subschema
             returns "\t\t-- " for depth 2, and so on
         """
-        output = "\t" * depth
-        if depth > 0:
-            output += "-" * depth
-            output += " "
-        return output
+        if depth < len(_OUTPUT_PREFIXES):
+            return _OUTPUT_PREFIXES[depth]
+        return "\t" * depth + "-" * depth + " "
 
     def format_humanreadable_instruction_output(
-        self, field: str, data: str, data_type: str, format_type: str
+        self, field: str, data: int, data_type: str, format_type: str, size: int
     ) -> str:
-        """Formats and returns output line for field based on the specified formatting"""
-        if format_type == "5min":
-            int_data = self.datastring_to_decimal(data, data_type) * 5
-            return f"{field}: {int_data} min\n"
-        if format_type == "5ms+5":
-            int_data = self.datastring_to_decimal(data, data_type) * 5 + 5
-            return f"{field}: {int_data} ms\n"
-        if format_type == "100ms":
-            int_data = self.datastring_to_decimal(data, data_type) * 100
-            return f"{field}: {int_data} ms\n"
-        if format_type == "1ms":
-            int_data = self.datastring_to_decimal(data, data_type)
-            return f"{field}: {int_data} ms\n"
-        if format_type == "decimal":
-            int_data = self.datastring_to_decimal(data, data_type)
-            return f"{field}: {int_data}\n"
+        """
+        Formats and returns output line for field based on the specified formatting
+        size is in bytes for hexadecimal data and in bits for binary data
+        """
+        value = self._format_humanreadable_value(data, data_type, format_type, size)
+        return f"{field}: {value}\n"
+
+    def _format_humanreadable_value(
+        self, data: int, data_type: str, format_type: str, size: int
+    ) -> str:
+        """Formats the value of a field for the human-readable output"""
+        # Most OCP 2.0 fields are output raw, so that case is checked first
+        if not format_type:
+            if data_type == "binary":
+                return f"0b{data:0{size}b}"
+            return f"0x{data:0{size * 2}x}"
+        formatter = _HUMANREADABLE_FORMATTERS.get(format_type)
+        if formatter is not None:
+            return formatter(data)
         if format_type == "uppercase":
-            return f"{field}: {data.upper()}\n"
+            return self.decimal_to_datastring(data, data_type, size).upper()
         if format_type == "timestamp":
-            data = self.format_timestamp_output(data, data_type)
-            return f"{field}: {data}\n"
+            return self._format_timestamp(data, data_type, size)
         if data_type == "binary":
-            return f"{field}: 0b{data}\n"
-        if data_type == "hexadecimal":
-            return f"{field}: 0x{data}\n"
-        raise ValueError("Unrecognized data type for human readable output formatting!")
+            return f"0b{data:0{size}b}"
+        return f"0x{data:0{size * 2}x}"
 
     def format_json_data(
-        self, field: str, data: str, data_type: str, format_type: str
+        self, field: str, data: int, data_type: str, format_type: str, size: int
     ) -> Dict[str, Union[str, int]]:
-        """Formats and returns a dictionary for a field based on the specified formatting"""
+        """
+        Formats and returns a dictionary for a field based on the specified formatting
+        size is in bytes for hexadecimal data and in bits for binary data
+        """
+        return {field: self._format_json_value(data, data_type, format_type, size)}
+
+    def _format_json_value(
+        self, data: int, data_type: str, format_type: str, size: int
+    ) -> Union[str, int]:
+        """Formats the value of a field for the JSON output"""
+        # Most OCP 2.0 JSON fields are decimal, so that case is checked first
         if format_type == "decimal":
-            int_data = self.datastring_to_decimal(data, data_type)
-            return {field: int_data}
-        if format_type == "decimal*5":
-            int_data = self.datastring_to_decimal(data, data_type) * 5
-            return {field: int_data}
-        if format_type == "decimal*5+5":
-            int_data = self.datastring_to_decimal(data, data_type) * 5 + 5
-            return {field: int_data}
-        if format_type == "decimal*100":
-            int_data = self.datastring_to_decimal(data, data_type) * 100
-            return {field: int_data}
+            return data
+        formatter = _JSON_FORMATTERS.get(format_type)
+        if formatter is not None:
+            return formatter(data)
         if format_type == "uppercase":
-            return {field: data.upper()}
+            return self.decimal_to_datastring(data, data_type, size).upper()
         if format_type == "timestamp":
-            return {field: self.format_timestamp_output(data, data_type)}
+            return self._format_timestamp(data, data_type, size)
         if data_type == "binary":
-            return {field: f"0b{data}"}
-        if data_type == "hexadecimal":
-            return {field: f"0x{data}"}
-        raise ValueError("Unrecognized data type for json output formatting!")
+            return f"0b{data:0{size}b}"
+        return f"0x{data:0{size * 2}x}"
 
     def has_json_field(self, schema: Dict[str, Union[str, list]]) -> bool:
         """Returns true if at least one instruction in the schema has a json field"""
-        instructions = schema.get("instructions", [])
-        for instruction in instructions:
-            if "json_field" in instruction:
-                return True
-        return False
+        return bool(self._compile_schema(schema).json_mask)
+
+    def to_buffer(self, data: LogData) -> BytesLike:
+        """
+        Returns log data as a bytes-like buffer
+        Bytes-like data is returned as is, a list of hex bytes such as
+        ['07','d7','a2'] is converted once into b"\\x07\\xd7\\xa2"
+        """
+        if isinstance(data, list):
+            return bytes.fromhex("".join(data))
+        return data
+
+    def hexdump_to_buffer(self, hexdump: str) -> bytes:
+        """
+        Returns the bytes of a hexdump, such as the nvme get-log output
+        Only whitespace separated two digit hex tokens are data, offsets and
+        the ascii column are skipped
+        """
+        return bytes.fromhex(
+            "".join(
+                token
+                for token in hexdump.split()
+                if len(token) == 2 and _HEX_DIGITS.issuperset(token)
+            )
+        )
+
+    def parse(
+        self, schema: Dict[str, Union[str, list]], data: LogData
+    ) -> List[ParsedField]:
+        """Decodes the log data into parsed fields following the schema"""
+        return self._parse(self._compile_schema(schema), self.to_buffer(data))
+
+    def parse_batch(
+        self, schema: Dict[str, Union[str, list]], logs: Iterable[LogData]
+    ) -> List[List[ParsedField]]:
+        """
+        Decodes the log data of several devices following the same schema
+        The schema is compiled once and reused for every log
+        """
+        compiled = self._compile_schema(schema)
+        return [self._parse(compiled, self.to_buffer(data)) for data in logs]
+
+    def _parse(self, compiled: _CompiledSchema, buffer: BytesLike) -> List[ParsedField]:
+        """
+        Parsed fields of the buffer following a compiled schema
+        Subschemas are walked with an explicit stack, byte level subschemas
+        read their fields from the buffer at the parent field offset and bit
+        level subschemas extract them from the parent field value
+        """
+        # Fields without a struct decoder are sliced, which does not copy a view
+        buffer = memoryview(buffer)
+        parsed_fields: List[ParsedField] = []
+        stack = [(compiled, 0, self._bit_level_value(compiled, buffer), parsed_fields)]
+        while stack:
+            compiled, base, value, subfields = stack.pop()
+            fields = self._decode_fields(compiled, buffer, base, value)
+            subfields.extend(
+                ParsedField(instruction, field_value, [])
+                for instruction, field_value in zip(compiled.instructions, fields)
+            )
+            # Pushed in reverse so subschemas are still walked by ascending offset
+            for index in reversed(compiled.decode_order):
+                instruction = compiled.instructions[index]
+                if instruction.subschema:
+                    stack.append(
+                        (
+                            instruction.subschema,
+                            base + instruction.offset,
+                            fields[index],
+                            subfields[index].subfields,
+                        )
+                    )
+        return parsed_fields
 
     def extract_humanreadable_output(
         self,
         schema: Dict[str, Union[str, list]],
-        bytelist: List[str],
+        bytelist: LogData,
         verbose: bool = False,
         depth: int = 0,
     ) -> str:
         """Processes the complete schema and returns a human-readble output string"""
-        output = ""
-        if schema["schema_level"] == "byte":
-            for instruction in schema["instructions"]:
-                verbose_only_field = instruction.get("verbose_only", False)
-                if not verbose and verbose_only_field:
-                    continue
-                field_name = instruction["field"]
-                format_type = instruction.get("format", "")
-                offset = instruction["offset"]
-                size = instruction["size"]
-                subschema = instruction.get("subschema", {})
-                field_bytelist = bytelist[offset : offset + size]
-                field_bytestring = self.bytelist_to_bytestring(
-                    field_bytelist, little_endian=True
-                )  # Assuming always little endian
-                output += self.format_humanreadable_output_prefix(depth)
-                if subschema and not verbose:
-                    output += f"{field_name}:\n"
-                else:
-                    output += self.format_humanreadable_instruction_output(
-                        field_name, field_bytestring, "hexadecimal", format_type
-                    )
-                if subschema:
-                    output += self.extract_humanreadable_output(
-                        subschema, field_bytelist, verbose, depth + 1
+        return self.format_humanreadable_output(
+            self.parse(schema, bytelist), verbose, depth
+        )
+
+    def write_humanreadable_output(
+        self,
+        schema: Dict[str, Union[str, list]],
+        bytelist: LogData,
+        file: TextIO,
+        verbose: bool = False,
+        depth: int = 0,
+    ) -> None:
+        """Processes the complete schema and writes the human-readable output to file"""
+        file.writelines(
+            self._humanreadable_lines(self.parse(schema, bytelist), verbose, depth)
+        )
+
+    def format_humanreadable_output(
+        self, fields: List[ParsedField], verbose: bool = False, depth: int = 0
+    ) -> str:
+        """Returns a human-readable output string for the parsed fields"""
+        return "".join(self._humanreadable_lines(fields, verbose, depth))
+
+    def _humanreadable_lines(
+        self, fields: List[ParsedField], verbose: bool, depth: int
+    ) -> Iterator[str]:
+        """Yields the human-readable output of the parsed fields piece by piece"""
+        stack = [
+            (
+                fields,
+                self._instruction_mask(
+                    (parsed_field.instruction for parsed_field in fields),
+                    lambda instruction: verbose or not instruction.verbose_only,
+                ),
+                depth,
+                self.format_humanreadable_output_prefix(depth),
+            )
+        ]
+        while stack:
+            # The line prefix is looked up once per subschema, not per field
+            fields, mask, depth, prefix = stack.pop()
+            if not mask:
+                continue
+            index = (mask & -mask).bit_length() - 1
+            # Remaining siblings are resumed once the subschema is output
+            stack.append((fields, mask & (mask - 1), depth, prefix))
+            parsed_field = fields[index]
+            instruction = parsed_field.instruction
+            yield prefix
+            if instruction.subschema and not verbose:
+                yield instruction.heading
+            else:
+                yield instruction.label
+                yield self._format_humanreadable_value(
+                    parsed_field.value,
+                    instruction.data_type,
+                    instruction.format_type,
+                    instruction.size,
+                )
+                yield "\n"
+            subschema = instruction.subschema
+            if subschema:
+                stack.append(
+                    (
+                        parsed_field.subfields,
+                        (
+                            (1 << len(subschema.instructions)) - 1
+                            if verbose
+                            else subschema.visible_mask
+                        ),
+                        depth + 1,
+                        self.format_humanreadable_output_prefix(depth + 1),
                     )
-        elif schema["schema_level"] == "bit":
-            bytestring = self.bytelist_to_bytestring(
-                bytelist, little_endian=True
-            )  # Assuming always little endian
-            bitstring = bin(int(bytestring, 16))[2:].zfill(len(bytelist) * 8)
-            for instruction in schema["instructions"]:
-                verbose_only_field = instruction.get("verbose_only", False)
-                if not verbose and verbose_only_field:
-                    continue
-                field_name = instruction["field"]
-                format_type = instruction.get("format", "")
-                offset = instruction["offset"]
-                size = instruction["size"]
-                field_bitstring = bitstring[
-                    len(bitstring) - offset - size : len(bitstring) - offset
-                ]
-                output += self.format_humanreadable_output_prefix(depth)
-                output += self.format_humanreadable_instruction_output(
-                    field_name, field_bitstring, "binary", format_type
                 )
-        else:
-            raise ValueError("Unrecognized schema level!")
-        return output
 
     def extract_json_output(
-        self, schema: Dict[str, Union[str, list]], bytelist: List[str]
+        self,
+        schema: Dict[str, Union[str, list]],
+        bytelist: LogData,
+        json_fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Union[str, int, dict]]:
+        """
+        Processes the complete schema and returns an output dictionary
+        When json_fields is given only those top level fields are formatted
+        """
+        return self.format_json_output(self.parse(schema, bytelist), json_fields)
+
+    def extract_humanreadable_and_json_output(
+        self,
+        schema: Dict[str, Union[str, list]],
+        bytelist: LogData,
+        verbose: bool = False,
+        json_fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[str, Dict[str, Union[str, int, dict]]]:
+        """
+        Processes the complete schema and returns both the human-readable output
+        string and the output dictionary, decoding the log data only once
+        """
+        fields = self.parse(schema, bytelist)
+        return (
+            self.format_humanreadable_output(fields, verbose),
+            self.format_json_output(fields, json_fields),
+        )
+
+    def format_json_output(
+        self,
+        fields: List[ParsedField],
+        json_fields: Optional[Iterable[str]] = None,
     ) -> Dict[str, Union[str, int, dict]]:
-        """Processes the complete schema and returns an output dictionary"""
+        """
+        Returns an output dictionary for the parsed fields
+        Values are only formatted here, so restricting json_fields skips the
+        formatting of every field that is not requested
+        """
+        if json_fields is not None:
+            json_fields = set(json_fields)
         output_dict = {}
-        if schema["schema_level"] == "byte":
-            for instruction in schema["instructions"]:
-                field_name = instruction.get("json_field", "")
-                if field_name:
-                    format_type = instruction.get("json_format", "")
-                    offset = instruction["offset"]
-                    size = instruction["size"]
-                    subschema = instruction.get("subschema", {})
-                    field_bytelist = bytelist[offset : offset + size]
-                    field_bytestring = self.bytelist_to_bytestring(
-                        field_bytelist, little_endian=True
-                    )  # Assuming always little endian
-                    if subschema and self.has_json_field(subschema):
-                        field_data = self.extract_json_output(subschema, field_bytelist)
-                        output_dict[field_name] = field_data
-                    else:
-                        output_dict.update(
-                            self.format_json_data(
-                                field_name, field_bytestring, "hexadecimal", format_type
-                            )
-                        )
-        elif schema["schema_level"] == "bit":
-            bytestring = self.bytelist_to_bytestring(
-                bytelist, little_endian=True
-            )  # Assuming always little endian
-            bitstring = bin(int(bytestring, 16))[2:].zfill(len(bytelist) * 8)
-            for instruction in schema["instructions"]:
-                field_name = instruction.get("json_field", "")
-                if field_name:
-                    format_type = instruction.get("json_format", "")
-                    offset = instruction["offset"]
-                    size = instruction["size"]
-                    field_bitstring = bitstring[
-                        len(bitstring) - offset - size : len(bitstring) - offset
-                    ]
-                    output_dict.update(
-                        self.format_json_data(
-                            field_name, field_bitstring, "binary", format_type
+        stack = [
+            (
+                fields,
+                self._instruction_mask(
+                    (parsed_field.instruction for parsed_field in fields),
+                    lambda instruction: bool(instruction.json_field)
+                    and (json_fields is None or instruction.json_field in json_fields),
+                ),
+                output_dict,
+            )
+        ]
+        while stack:
+            fields, mask, current_dict = stack.pop()
+            while mask:
+                index = (mask & -mask).bit_length() - 1
+                mask &= mask - 1
+                parsed_field = fields[index]
+                instruction = parsed_field.instruction
+                field_name = instruction.json_field
+                subschema = instruction.subschema
+                if subschema and subschema.json_mask:
+                    current_dict[field_name] = {}
+                    stack.append(
+                        (
+                            parsed_field.subfields,
+                            subschema.json_mask,
+                            current_dict[field_name],
                         )
                     )
-        else:
-            raise ValueError("Unrecognized schema level!")
+                    continue
+                current_dict[field_name] = self._format_json_value(
+                    parsed_field.value,
+                    instruction.data_type,
+                    instruction.json_format,
+                    instruction.size,
+                )
         return output_dict
 
 
@@ -2317,28 +1185,24 @@ def main():
     lmparser = LatencyMonitorLogParser()
 
     if args.schemafile:
-        schemafile = open(args.schemafile)
-        schema = json.load(schemafile)
-        schemafile.close()
+        with open(args.schemafile) as schemafile:
+            schema = json.load(schemafile)
     else:
         schema = lmparser.OCP2_SCHEMA
 
     if args.raw_binary:
-        inputfile = open(args.inputfile, "rb")
-        inputfiledata = inputfile.read()
-        bytelist = inputfiledata.hex(" ", 1).split()
+        with open(args.inputfile, "rb") as inputfile:
+            # The mapping stays valid after the file is closed and avoids a copy
+            logdata = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
     else:
-        inputfile = open(args.inputfile, "rt")
-        inputfiledata = inputfile.read()
-        byteregex = r"(?<!\S)[0-9a-fA-F]{2}(?!\S)"
-        bytelist = re.findall(byteregex, inputfiledata)
-    inputfile.close()
+        with open(args.inputfile, "rt") as inputfile:
+            logdata = lmparser.hexdump_to_buffer(inputfile.read())
 
     if args.outputformat == "text":
-        output = lmparser.extract_humanreadable_output(schema, bytelist, args.verbose)
-        print(output)
+        lmparser.write_humanreadable_output(schema, logdata, sys.stdout, args.verbose)
+        print()
     elif args.outputformat == "json":
-        output_dict = lmparser.extract_json_output(schema, bytelist)
+        output_dict = lmparser.extract_json_output(schema, logdata)
         output = json.dumps(output_dict, indent=4, separators=(",", ": "))
         print(output)
     else:
@@ -2,18 +2,20 @@
 
 # pyre-unsafe
 """library to manage nvme drive"""
+import copy
+import functools
 import json
 import os
 import re
 import time
 from enum import Enum
 from time import sleep
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, NoReturn, Optional, Pattern
 
 from autoval.lib.host.component.component import COMPONENT
 
 from autoval.lib.utils.autoval_errors import ErrorType
-from autoval.lib.utils.autoval_exceptions import AutovalFileNotFound, TestError
+from autoval.lib.utils.autoval_exceptions import TestError
 from autoval.lib.utils.autoval_log import AutovalLog
 from autoval.lib.utils.autoval_utils import AutovalUtils
 from autoval.lib.utils.decorators import retry
@@ -30,22 +32,63 @@ from autoval_ssd.lib.utils.storage.nvme.nvme_utils import NVMeUtils
 
 
 DEFAULT_VALIDATE_CONFIG = "nvme_validate.json"
+# Seconds for which a smart log read is reused by get_smart_log
+SMART_LOG_CACHE_TIMEOUT = 5
+
+# Path of the package root holding cfg/, resolved once since __file__ never changes
+_TARGET_PATH_MATCH = re.search(r"^(/.*?)/lib", os.path.abspath(__file__))
+_TARGET_PATH = _TARGET_PATH_MATCH.group(1) if _TARGET_PATH_MATCH else ""
+_GIB = 1 << 30
+# Seconds to wait after a controller reset before its state is polled,
+# and between two polls
+RESET_READY_MIN_WAIT = 1
+RESET_READY_POLL_INTERVAL = 0.5
+# Largest firmware image chunk sent per fw-download admin command
+_FW_DOWNLOAD_MAX_XFER = 128 * 1024
+# Parsed validate configs keyed by absolute path, shared by all drives
+_CONFIG_CACHE: Dict[str, dict] = {}
+
+_FW_REVISION_PATTERN = re.compile(r"^\s*fr\s+:\s+(.*)", re.MULTILINE)
+_MTFA_PATTERN = re.compile(r"mtfa\s+:\s+(.*)")
+_FEATURE_VALUE_PATTERN = re.compile(r"value:\s*(\S+)")
+_VS_TIMESTAMP_PATTERN = re.compile(r"The timestamp is\s+:\s+(\d+)")
+_FW_SLOTS_PATTERN = re.compile(r"(0x\d)\s+Number of Firmware Slots")
+_FW_SLOT_READ_ONLY_PATTERN = re.compile(r"(0x\d)\s+Firmware Slot\s.*\sRead-Only")
+_POWER_MODE_PATTERN = re.compile(r"ps\s+(\d+)\s+:\s+.*W\s+operational\s+.*")
+_LSPCI_ERROR_FLAGS_PATTERN = re.compile(
+    r"\s+(Fatal[+-]|FatalErr[+-]|UnsuppReg[+-]|UnsupReg[+-])"
+)
+_DEGRADED_FIRMWARE_PATTERN = re.compile(r"^error.*$", re.IGNORECASE)
+_SID_STATE_PATTERN = re.compile(r"04\s02\s\S{2}\s\S{2}\s(\S{2})\s")
+_FW_RESET_REQUIRED_PATTERN = re.compile(
+    r"firmware requires (subsystem|any controller) reset"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _smart_log_field_pattern(key: str) -> Pattern:
+    """Compiled pattern of an integer field in the smart-log json text"""
+    return re.compile(r'"%s"\s*:\s*(\d+)\s*[,}]' % re.escape(key))
 
 
 def _strip_white_spaces_from_keys(mapping: dict) -> None:
     """
-    Recursively remove white spaces from key names of a dictionary in place
+    Remove white spaces from key names of a dictionary and its nested
+    dictionaries in place
 
     Args:
         mapping: Dictionary to be modified
     """
-    for k, v in list(mapping.items()):
-        _k = k.strip()
-        if _k != k:
-            mapping[_k] = v
-            del mapping[k]
-        if isinstance(v, dict):
-            _strip_white_spaces_from_keys(v)
+    stack = [mapping]
+    while stack:
+        current = stack.pop()
+        for k, v in list(current.items()):
+            _k = k.strip()
+            if _k != k:
+                current[_k] = v
+                del current[k]
+            if isinstance(v, dict):
+                stack.append(v)
 
 
 class OwnershipStatus(Enum):
@@ -73,7 +116,12 @@ class NVMeDrive(Drive):
         "0xB",
         "0xE",
     ]
+    # Printed between the outputs of the batched get-feature commands
+    FEATURE_OUTPUT_SEPARATOR = "--- nvme get-feature ---"
     NVMECLI_MANUFACTURER = None
+    # Vendor subclasses with a known smart log layout can list its keys here
+    # to skip reading the smart log when the validate config is loaded
+    STATIC_SMART_LOG_KEYS: Optional[FrozenSet[str]] = None
 
     def __init__(self, host, block_name, config=None) -> None:
         """
@@ -92,6 +140,8 @@ class NVMeDrive(Drive):
         if config is None:
             config = DEFAULT_VALIDATE_CONFIG
         self.interface = DriveInterface.NVME
+        self._devpath = f"/dev/{block_name}"
+        self._nvme_list_entry = NVMeUtils.get_nvme_list_entry(host, block_name)
         self.serial_number = self.get_serial_number()
         self.model = self._get_model()
         self.manufacturer = self.get_manufacturer()
@@ -102,6 +152,8 @@ class NVMeDrive(Drive):
         self.id_ctrl = self.get_id_ctrl()
         self.vendor_entry = None
         self.smart_log_keys = None
+        self._smart_log = None
+        self._smart_log_time = 0.0
         self.validate_config = self.load_config(config)
         self.fw_ns_action_model_map = {}
         self.fw_update_reset_req_models = []
@@ -119,11 +171,17 @@ class NVMeDrive(Drive):
         self.workload_target_drives: List = []
         self.lmparser_ocp_2_0_drives = {}
         self.cfg_dir = ""
+        self._nvme_id_ctrl_outputs: Dict[bool, str] = {}
+        self._id_ns = None
+        self._id_ns_json = None
 
     def get_smart_log_keys(self) -> None:
         """
         Method to get list of applicable smart log keys for a drive
         """
+        if self.STATIC_SMART_LOG_KEYS is not None:
+            self.smart_log_keys = self.STATIC_SMART_LOG_KEYS
+            return
         if not self.smart_log_keys:
             smart_log = self.get_smart_log()
             self.smart_log_keys = self._flatten_validate_config_dict(smart_log).keys()
@@ -139,33 +197,25 @@ class NVMeDrive(Drive):
         relative_cfg_file_path = "/cfg/" + relative_cfg_file_path
         abs_path = self.get_target_path()
         nvme_cfg_path = abs_path + relative_cfg_file_path
-        content = FileActions.read_data(nvme_cfg_path, json_file=True)
+        content = _CONFIG_CACHE.get(nvme_cfg_path)
+        if content is None:
+            content = FileActions.read_data(nvme_cfg_path, json_file=True)
+            _CONFIG_CACHE[nvme_cfg_path] = content
+        # Shallow copy into config, the cached content must stay unmodified
         config.update(content["nvme"])
         self.get_smart_log_keys()
-        config = self._flatten_validate_config_dict(config)
-        validate_config = {
-            key: config[key] for key in self.smart_log_keys if key in config
-        }
-        return validate_config
+        return self._flatten_and_filter(config, self.smart_log_keys)
 
     @staticmethod
     def get_target_path() -> str:
         """
         Returns the path of the target path which is used to get the cfg path in the autoval-oss
         """
-        # Get the absolute path of the current file
-        target_path = ""
-        current_file_path = os.path.abspath(__file__)
-        try:
-            pattern = r"^(/.*?)/lib"
-            match = re.search(pattern, current_file_path)
-            if match:
-                target_path = match.group(1)
-        except Exception:
-            raise AutovalFileNotFound("The required file path is not found")
-        return target_path
+        return _TARGET_PATH
 
-    def _get_config_dir(self, ext_file) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_config_dir(ext_file) -> str:
         """
         JSON files specific for Flash Data Integirty tests are placed in
             nvme_smart_fdi. Other files go in nvme_smart.
@@ -199,19 +249,33 @@ class NVMeDrive(Drive):
         to
             { "item_1": "==", "item_a": "<", ...  }
         """
+        return self._flatten_and_filter(config)
+
+    def _flatten_and_filter(self, config, allowed_keys=None):
+        """
+        Flatten config like _flatten_validate_config_dict, keeping only the
+        items whose key is in allowed_keys when it is given
+        """
         flat = {}
-        for each in config:
-            if isinstance(config[each], dict):
-                flat.update(self._flatten_validate_config_dict(config[each]))
+        # Nested dicts are walked depth first in key order, so a later
+        # duplicate key overrides an earlier one as before
+        stack = [iter(config.items())]
+        while stack:
+            for key, value in stack[-1]:
+                if isinstance(value, dict):
+                    stack.append(iter(value.items()))
+                    break
+                if allowed_keys is None or key in allowed_keys:
+                    flat[key] = value
             else:
-                flat[each] = config[each]
+                stack.pop()
         return flat
 
     def get_arbitration_mechanism_status(self):
         """
         Method to get the controller properties
         """
-        nvme_drive = "/dev/%s" % self.block_name
+        nvme_drive = self._devpath
         cmd = "nvme show-regs %s -H" % nvme_drive
         out = AutovalUtils.validate_no_exception(
             self.host.run,
@@ -226,7 +290,7 @@ class NVMeDrive(Drive):
         """
         Method to run nvme read command
         """
-        nvme_drive = f"/dev/{self.block_name}"
+        nvme_drive = self._devpath
         cmd = f"nvme read {nvme_drive} --data-size=520 --prinfo=1"
         out = AutovalUtils.validate_no_exception(
             self.host.run,
@@ -237,37 +301,74 @@ class NVMeDrive(Drive):
         )
         return out
 
-    def get_nvme_id_ctrl(self, human_readable=None, grep: str = "-v fguid") -> str:
+    def get_nvme_id_ctrl(
+        self, human_readable=None, grep: Optional[str] = "-v fguid"
+    ) -> str:
         """
         Method to get nvme_id_ctrl command output
-        """
-        nvme_drive = f"/dev/{self.block_name}"
-        cmd = f"nvme id-ctrl {nvme_drive} "
-        if human_readable:
-            cmd += "-H "
+        The grep filter ("pattern" or "-v pattern") is applied on the returned lines
+        The output is cached, call refresh_nvme_id_ctrl to run the command again
+        """
+        human_readable = bool(human_readable)
+        out = self._nvme_id_ctrl_outputs.get(human_readable)
+        if out is None:
+            nvme_drive = self._devpath
+            cmd = f"nvme id-ctrl {nvme_drive}"
+            if human_readable:
+                cmd += " -H"
+            out = AutovalUtils.validate_no_exception(
+                self.host.run,
+                [cmd],
+                f"Run '{cmd}'",
+                component=COMPONENT.STORAGE_DRIVE,
+                error_type=ErrorType.NVME_ERR,
+            )
+            self._nvme_id_ctrl_outputs[human_readable] = out
         if grep:
-            cmd += f"| grep {grep}"
-        out = AutovalUtils.validate_no_exception(
-            self.host.run,
-            [cmd],
-            f"Run '{cmd}'",
-            component=COMPONENT.STORAGE_DRIVE,
-            error_type=ErrorType.NVME_ERR,
-        )
+            out = self._grep_lines(out, grep)
         return out
 
+    @staticmethod
+    def _grep_lines(out: str, grep: str) -> str:
+        """
+        Method to keep the lines matching the grep pattern, "-v pattern" drops them
+        """
+        invert = grep.startswith("-v ")
+        if invert:
+            grep = grep[3:]
+        pattern = re.compile(grep.strip())
+        return "\n".join(
+            line
+            for line in out.splitlines()
+            if (pattern.search(line) is None) == invert
+        )
+
+    def get_nvme_id_ctrl_human_readable(self) -> str:
+        """
+        Method to get the complete human readable nvme id-ctrl output
+        """
+        return self.get_nvme_id_ctrl(human_readable=True, grep=None)
+
+    def refresh_nvme_id_ctrl(self) -> None:
+        """
+        Method to drop the cached nvme id-ctrl outputs, eg. after a firmware activation
+        """
+        self._nvme_id_ctrl_outputs = {}
+
     def get_nvme_id_ctrl_apsta(self) -> str:
         """
         Method to get apsta from nvme id-ctrl command
         """
-        return self.get_nvme_id_ctrl(self, grep="apsta")
+        return self.get_nvme_id_ctrl(grep="apsta")
 
     def get_nvme_id_ctrl_fw_revision(self) -> str:
         """
         Method to get firmware revision from id-ctrl command
+        The command is always run again, as it is used to verify a firmware update
         """
-        out = self.get_nvme_id_ctrl(grep="fr")
-        match = re.search(r"fr\s+:\s+(.*)", out)
+        self._nvme_id_ctrl_outputs.pop(False, None)
+        out = self.get_nvme_id_ctrl(grep=None)
+        match = _FW_REVISION_PATTERN.search(out)
         if match:
             fw_version = match.group(1)
             return str(fw_version)
@@ -282,8 +383,8 @@ class NVMeDrive(Drive):
         """
         Mathod to get the Maximum Time For Activation value from id-ctrl command
         """
-        out = self.get_nvme_id_ctrl(grep="mtfa")
-        match = re.search(r"mtfa\s+:\s+(.*)", out)
+        out = self.get_nvme_id_ctrl_human_readable()
+        match = _MTFA_PATTERN.search(out)
         if match:
             mtfa = match.group(1)
             return int(mtfa)
@@ -312,7 +413,7 @@ class NVMeDrive(Drive):
         """
         Method to retrieve the firmware log for the specified device
         """
-        nvme_drive = "/dev/%s" % self.block_name
+        nvme_drive = self._devpath
         cmd = "nvme fw-log %s -o json" % nvme_drive
         out = AutovalUtils.validate_no_exception(
             self.host.run,
@@ -327,8 +428,8 @@ class NVMeDrive(Drive):
         """
         Method to validate if the drive has crypto erase support
         """
-        out = self.get_nvme_id_ctrl(human_readable=True)
-        if re.search(r"Crypto Erase Supported", out) is not None:
+        out = self.get_nvme_id_ctrl_human_readable()
+        if "Crypto Erase Supported" in out:
             return True
         AutovalLog.log_info(
             "%s drive on the DUT does not support crypto erase " % self.block_name
@@ -339,7 +440,7 @@ class NVMeDrive(Drive):
         """
         Method to retrieve specified number of error log entries from a given device
         """
-        nvme_drive = "/dev/%s" % self.block_name
+        nvme_drive = self._devpath
         cmd = "nvme error-log %s -o json" % nvme_drive
         out = AutovalUtils.validate_no_exception(
             self.host.run,
@@ -353,10 +454,13 @@ class NVMeDrive(Drive):
     def get_id_ns(self):
         """
         Method to log the properties of the specified namespace
+        The output is kept for _get_id_ns_json until the next read
         """
-        nvme_drive = "/dev/%s" % self.block_name
+        nvme_drive = self._devpath
         cmd = "nvme id-ns %s -o json" % nvme_drive
         out = self.host.run(cmd=cmd)
+        self._id_ns = out
+        self._id_ns_json = None
         return out
 
     def get_size(self, param) -> int:
@@ -374,28 +478,47 @@ class NVMeDrive(Drive):
         -------
         size: nvme id-ns output result: Integer
         """
-        out = self.get_id_ns()
-        out_json = json.loads(out)
-        size = out_json[param]
+        # nuse changes with every write, so the namespace is read again
+        self.get_id_ns()
+        size = self._get_id_ns_json()[param]
         return size
 
+    def _get_id_ns_json(self) -> Dict:
+        """
+        Method to get the parsed output of the last get_id_ns call, running
+        it when there is none. The output is cached, call refresh_id_ns to
+        run the command again
+        """
+        if self._id_ns_json is None:
+            out = self._id_ns if self._id_ns is not None else self.get_id_ns()
+            try:
+                self._id_ns_json = json.loads(out)
+            except json.decoder.JSONDecodeError:
+                raise TestError(
+                    f"Failed to convert to JSON: {out}",
+                    component=COMPONENT.STORAGE_DRIVE,
+                    error_type=ErrorType.TOOL_ERR,
+                )
+        return self._id_ns_json
+
+    def refresh_id_ns(self) -> None:
+        """
+        Method to drop the cached nvme id-ns output, eg. after a format
+        """
+        self._id_ns = None
+        self._id_ns_json = None
+
     def get_bs_size(self) -> int:
         """
         Get current formatted block size
         """
-        nvme_drive = "/dev/%s" % self.block_name
-        cmd = "nvme id-ns %s -H" % nvme_drive
-        out = AutovalUtils.validate_no_exception(
-            self.host.run,
-            [cmd],
-            "Run '%s'" % cmd,
-            component=COMPONENT.STORAGE_DRIVE,
-            error_type=ErrorType.NVME_ERR,
-        )
-        match = re.search(r".*\s+(\d+)\s+bytes.*(in\s+use)", out)
-        if match:
-            current = match.group(1)
-            return int(current)
+        id_ns = self._get_id_ns_json()
+        lbafs = id_ns.get("lbafs", [])
+        # FLBAS bits 3:0 and 6:5 hold the lower and upper bits of the format index
+        flbas = id_ns.get("flbas", 0)
+        index = (flbas & 0xF) | ((flbas & 0x60) >> 1)
+        if index < len(lbafs):
+            return 1 << lbafs[index]["ds"]
         raise TestError(
             "Block size not found for %s" % self.block_name,
             component=COMPONENT.STORAGE_DRIVE,
@@ -406,20 +529,9 @@ class NVMeDrive(Drive):
         """
         Get list of supported block sizes
         """
-        nvme_drive = "/dev/%s" % self.block_name
-        cmd = "nvme id-ns %s -H" % nvme_drive
-        out = AutovalUtils.validate_no_exception(
-            self.host.run,
-            [cmd],
-            "Run '%s'" % cmd,
-            component=COMPONENT.STORAGE_DRIVE,
-            error_type=ErrorType.NVME_ERR,
-        )
-        if out:
-            bs_list = re.findall(r".*\s+(\d+)\s+bytes\s+", out)
-            if bs_list:
-                bs_list = [int(i) for i in bs_list]
-                return bs_list
+        bs_list = [1 << lbaf["ds"] for lbaf in self._get_id_ns_json().get("lbafs", [])]
+        if bs_list:
+            return bs_list
         raise TestError(
             "List of block size not found for %s" % self.block_name,
             component=COMPONENT.STORAGE_DRIVE,
@@ -436,17 +548,26 @@ class NVMeDrive(Drive):
             feature_ids = feature_id
         else:
             feature_ids = NVMeDrive.FEATURE_IDS
-        nvme_drive = "/dev/%s" % self.block_name
-        features_info = []
+        if not feature_ids:
+            return []
+        nvme_drive = self._devpath
+        cmds = []
         for _id in feature_ids:
             if queue_id:
-                cmd = f"nvme get-feature {nvme_drive} -f {_id} -H {queue_id}"
+                cmds.append(f"nvme get-feature {nvme_drive} -f {_id} -H {queue_id}")
+            else:
+                cmds.append(f"nvme get-feature {nvme_drive} -f {_id} -H")
+        # Run all the features in one host command, stopping at the first failure
+        cmd = f" && echo '{self.FEATURE_OUTPUT_SEPARATOR}' && ".join(cmds)
+        out = self.host.run_get_result(cmd=cmd).stdout  # noqa
+        features_lines = [[]]
+        for line in out.splitlines():
+            line = line.strip()
+            if line == self.FEATURE_OUTPUT_SEPARATOR:
+                features_lines.append([])
             else:
-                cmd = f"nvme get-feature {nvme_drive} -f {_id} -H"
-            out = self.host.run_get_result(cmd=cmd).stdout  # noqa
-            feature_info = ",".join([s.strip() for s in out.splitlines()])
-            features_info.append(feature_info)
-        return features_info
+                features_lines[-1].append(line)
+        return [",".join(lines) for lines in features_lines]
 
     def get_capacity(self, unit: str = "byte"):
         """Return drive capacity"""
@@ -455,10 +576,22 @@ class NVMeDrive(Drive):
 
     def get_serial_number(self):
         """Return drive serial_number"""
-        return NVMeUtils.get_from_nvme_list(self.host, self.block_name, "SerialNumber")
+        return self._get_from_nvme_list_entry("SerialNumber")
 
     def _get_model(self):
-        return NVMeUtils.get_from_nvme_list(self.host, self.block_name, "ModelNumber")
+        return self._get_from_nvme_list_entry("ModelNumber")
+
+    def _get_from_nvme_list_entry(self, field: str):
+        """
+        Return a field of the nvme list entry read at init, which is only
+        used for fields that do not change, eg. serial number and model
+        """
+        if field not in self._nvme_list_entry:
+            return NVMeUtils.get_from_nvme_list(self.host, self.block_name, field)
+        value = self._nvme_list_entry[field]
+        if isinstance(value, str):
+            return value.strip()
+        return value
 
     def get_firmware_version(self):
         """Return drive FW version"""
@@ -470,8 +603,17 @@ class NVMeDrive(Drive):
 
     @retry(tries=3, sleep_seconds=30)
     def get_smart_log(self):
-        """Return drive smart log"""
-        cmd = "nvme smart-log /dev/%s -o json" % self.block_name
+        """
+        Return drive smart log
+        A smart log read within SMART_LOG_CACHE_TIMEOUT seconds is reused,
+        call refresh_smart_log to force a new read
+        """
+        if (
+            self._smart_log is not None
+            and time.monotonic() - self._smart_log_time < SMART_LOG_CACHE_TIMEOUT
+        ):
+            return copy.deepcopy(self._smart_log)
+        cmd = f"nvme smart-log {self._devpath} -o json"
         output = self.host.run(cmd=cmd)
         try:
             log = json.loads(output)
@@ -483,13 +625,62 @@ class NVMeDrive(Drive):
             )
         smart_log = {"smart-log": log}
         smart_log.update(self.get_ocp_smart_log())
-        return smart_log
+        self._smart_log = smart_log
+        self._smart_log_time = time.monotonic()
+        return copy.deepcopy(smart_log)
+
+    def _get_smart_log_field(self, key: str):
+        """
+        Return one integer field of the nvme smart-log, reusing a fresh
+        get_smart_log read. Otherwise only the smart-log command is run and
+        the field is picked from its json text without parsing all of it
+        """
+        if (
+            self._smart_log is not None
+            and time.monotonic() - self._smart_log_time < SMART_LOG_CACHE_TIMEOUT
+        ):
+            smart_log = self._smart_log["smart-log"]
+            if key not in smart_log:
+                self._raise_smart_log_field_not_found(key, smart_log)
+            return smart_log[key]
+        output = self._run_smart_log()
+        match = _smart_log_field_pattern(key).search(output)
+        if match:
+            return int(match.group(1))
+        try:
+            smart_log = json.loads(output)
+        except json.decoder.JSONDecodeError:
+            raise TestError(
+                f"Failed to convert to JSON: {output}",
+                component=COMPONENT.STORAGE_DRIVE,
+                error_type=ErrorType.TOOL_ERR,
+            )
+        if key not in smart_log:
+            self._raise_smart_log_field_not_found(key, output)
+        return smart_log[key]
+
+    @retry(tries=3, sleep_seconds=30)
+    def _run_smart_log(self) -> str:
+        """Run the nvme smart-log command, retried as in get_smart_log"""
+        return self.host.run(cmd=f"nvme smart-log {self._devpath} -o json")
+
+    @staticmethod
+    def _raise_smart_log_field_not_found(key: str, smart_log) -> NoReturn:
+        raise TestError(
+            f"Failed to find {key} in smart-log: {smart_log}",
+            component=COMPONENT.STORAGE_DRIVE,
+            error_type=ErrorType.TOOL_ERR,
+        )
+
+    def refresh_smart_log(self) -> None:
+        """Method to drop the smart log reused by get_smart_log"""
+        self._smart_log = None
 
     def get_ocp_smart_log(self) -> Dict:
         """
         Collect OCP smart log and return it.
         """
-        cmd = "nvme ocp smart-add-log /dev/%s -o json" % self.block_name
+        cmd = f"nvme ocp smart-add-log {self._devpath} -o json"
         try:
             out = self.host.run(cmd)
             log = json.loads(out)
@@ -505,14 +696,15 @@ class NVMeDrive(Drive):
                 f"ocp-smart-add-log is not supported on the drive {self.block_name} ({self.model})."
             )
             return {}
+        # Single pass over the flattened log, only hex strings need a try
         for k, v in result.items():
             if isinstance(v, int):
                 result[k] = float(v)
             elif isinstance(v, str):
                 try:
                     result[k] = float(int(v, 16))
-                except Exception:
-                    result[k] = v
+                except ValueError:
+                    pass
         return {"ocp-smart-add-log": result}
 
     def get_internal_log(self) -> bool:
@@ -526,7 +718,7 @@ class NVMeDrive(Drive):
         bool: The completion status of internal log file generation.
         """
         dut_logdir = SiteUtils.get_dut_logdir(self.host.hostname)
-        cmd = "nvme ocp internal-log /dev/%s" % self.block_name
+        cmd = f"nvme ocp internal-log {self._devpath}"
         ret = self.host.run_get_result(
             cmd=cmd, ignore_status=True, working_directory=dut_logdir
         )
@@ -550,7 +742,7 @@ class NVMeDrive(Drive):
         TestStepError
             When fails to retrieve the command effects log.
         """
-        cmd = "nvme effects-log /dev/%s -o json" % self.block_name
+        cmd = f"nvme effects-log {self._devpath} -o json"
         out = self.host.run(cmd=cmd)
         return json.loads(out)
 
@@ -617,7 +809,8 @@ class NVMeDrive(Drive):
             return False
         nand_write_formula = {
             "field": "Physical media units written_lo",
-            "formula": f"NAND_WRITE/{pow(1024, 3)}",
+            "formula": f"NAND_WRITE/{_GIB}",
+            "divisor": _GIB,
         }
 
         nand_write_before = smart_before["ocp-smart-add-log"][
@@ -680,32 +873,35 @@ class NVMeDrive(Drive):
             (difference of data units written before and after the test)
         @params: n_write | nand_delta
             (difference of nand units written before and after the test)
-        @params: nand_write_formula | vendor specific nand write field
+        @params: nand_write_formula | vendor specific nand write field, with
+            either a numeric "divisor" or a "formula" string
         @Returns: Write Amplication Factor
         """
         try:
-            host_write = int(h_write) * 512 * 1000 / pow(1024, 3)
-            value = (
-                nand_write_formula["formula"]
-                .replace("NAND_WRITE", str(n_write))
-                .replace("value", str(n_write))
-                .split("/")
-            )
-            nand_writes = self._str_to_float(value[0]) / self._str_to_float(value[1])
+            host_write = int(h_write) * 512 * 1000 / _GIB
+            if "divisor" in nand_write_formula:
+                nand_writes = float(n_write) / nand_write_formula["divisor"]
+            else:
+                value = (
+                    nand_write_formula["formula"]
+                    .replace("NAND_WRITE", str(n_write))
+                    .replace("value", str(n_write))
+                    .split("/")
+                )
+                nand_writes = self._str_to_float(value[0]) / self._str_to_float(
+                    value[1]
+                )
             waf = nand_writes / host_write
         except ZeroDivisionError as exc:
             return None, exc
         return waf, None
 
     def _str_to_float(self, value) -> float:
-        """Helper function for complex formula"""
-        match = re.search(r"(\d+)\s*\**\s*(\d*)", value)
-        # pyre-fixme[16]: Optional type has no attribute `group`.
-        if match.group(2):
-            total = float(match.group(2)) * float(match.group(1))
-        else:
-            total = float(match.group(1))
-        return total
+        """Helper function for complex formula, eg. "1024 * 1024" """
+        parts = [part for part in value.replace(" ", "").split("*") if part]
+        if len(parts) == 2:
+            return float(parts[0]) * float(parts[1])
+        return float(parts[0])
 
     def convert_nand_write(self, nand_write) -> float:
         """Convert nand write to float"""
@@ -728,26 +924,34 @@ class NVMeDrive(Drive):
             e.g. "nvme1n1" -> "nvme1"
         @return string
         """
-        match = re.search(r"(nvme\d+)", self.block_name)
-        if not match:
+        name = self.block_name
+        end = 4
+        if name.startswith("nvme"):
+            while end < len(name) and name[end].isdigit():
+                end += 1
+        if end == 4:
             _msg = "Failed to get NVMe drive name from block name %s" % self.block_name
             raise TestError(
                 _msg,
                 error_type=ErrorType.NVME_ERR,
             )
-        return match.group(1)
+        return name[:end]
 
     def collect_data(self):
+        # One nvme list read serves both the firmware and the capacity
+        nvme_list_entry = NVMeUtils.get_nvme_list_entry(self.host, self.block_name)
         data = {
             "SMART": self.get_smart_log(),
-            "firmware": self.get_firmware_version(),
+            "firmware": NVMeUtils.get_nvme_list_field(nvme_list_entry, "Firmware"),
             "serial_number": self.serial_number,
             "type": self.type.value,
             "interface": self.interface.value,
             "model": self.model,
             "manufacturer": self.manufacturer,
             "id_ctrl": self.id_ctrl,
-            "capacity": self.get_capacity(),
+            "capacity": DiskUtils.convert_from_bytes(
+                NVMeUtils.get_nvme_list_field(nvme_list_entry, "PhysicalSize"), "byte"
+            ),
             "id_ns": self.get_id_ns(),
         }
         _strip_white_spaces_from_keys(data)
@@ -781,6 +985,7 @@ class NVMeDrive(Drive):
         # arg[1] will have firmware binary location.
         expected_fw_version = args[0]
         fw_bin_loc = args[1]
+        self.refresh_nvme_id_ctrl()
         fw_slots = kwargs.get("fw_slots", [])
         action = kwargs.get("action", 1)
         force = kwargs.get("force", False)
@@ -838,7 +1043,6 @@ class NVMeDrive(Drive):
                 commit action, admin and IO commands take and validate them. We do not require timers for
                 general flash_firmware_update test. Hence, including an if else condition here.
                 """
-                fw_ver = self.get_nvme_id_ctrl_fw_revision()  # noqa
                 self.fw_commit_timer_before = time.perf_counter()  # noqa
                 if action == 2:
                     # As per the nvme spec action 2 will only avtivates the
@@ -871,11 +1075,9 @@ class NVMeDrive(Drive):
                         )
                         self.reset()
                 self.fw_commit_timer_after = time.perf_counter()  # noqa
-                self.command_timer_before = time.perf_counter()  # noqa
-                self.admin_command = self.get_nvme_id_ctrl()  # noqa
-                self.admin_command_timer_after = time.perf_counter()  # noqa
-                self.io_command = self.get_nvme_read()  # noqa
-                self.io_command_timer_after = time.perf_counter()  # noqa
+                # Drop the cached output so the timed probe really runs the command
+                self.refresh_nvme_id_ctrl()
+                self._run_timed_admin_io_commands()
 
             elif nvme_admin_io is False:
                 if action == 2:
@@ -917,6 +1119,19 @@ class NVMeDrive(Drive):
                         self.reset()
             self.validate_firmware_update(expected_fw_version)
 
+    def _run_timed_admin_io_commands(self) -> None:
+        """
+        Issue the admin (id-ctrl) probe and then the IO (read) probe and
+        record when each of them completes, both timed from
+        command_timer_before
+        """
+        self.command_timer_before = time.perf_counter()  # noqa
+        # Unfiltered so the timer only covers the admin command round trip
+        self.admin_command = self.get_nvme_id_ctrl(grep=None)  # noqa
+        self.admin_command_timer_after = time.perf_counter()  # noqa
+        self.io_command = self.get_nvme_read()  # noqa
+        self.io_command_timer_after = time.perf_counter()  # noqa
+
     def _fw_download(self, drive_name, file_name) -> None:
         """
         This method downloads the firmware binary file that is
@@ -930,8 +1145,30 @@ class NVMeDrive(Drive):
             Firmware binary path.
         """
         cmd = f"nvme fw-download /dev/{drive_name} -f '{file_name}'"
+        xfer = self._get_fw_download_xfer()
+        if xfer:
+            cmd += f" --xfer={xfer}"
         AutovalLog.log_info(self.host.run(cmd=cmd))  # noqa
 
+    def _get_fw_download_xfer(self) -> int:
+        """
+        Return the fw-download transfer size in bytes, the largest chunk the
+        controller accepts (MDTS) up to _FW_DOWNLOAD_MAX_XFER, in multiples
+        of the firmware update granularity (FWUG). 0 leaves it to nvme-cli
+        """
+        try:
+            mdts = int(self.id_ctrl.get("mdts", 0))
+            fwug = int(self.id_ctrl.get("fwug", 0))
+        except (AttributeError, TypeError, ValueError):
+            return 0
+        xfer = _FW_DOWNLOAD_MAX_XFER
+        if mdts:
+            xfer = min(xfer, 4096 << mdts)
+        # FWUG is in 4 KiB units, 0 and 0xFF give no restriction
+        if fwug not in (0, 0xFF):
+            xfer -= xfer % (fwug * 4096)
+        return xfer
+
     def fw_activate(
         self,
         drive_name: str,
@@ -969,15 +1206,16 @@ class NVMeDrive(Drive):
         try:
             AutovalLog.log_info(self.host.run(cmd=cmd))  # noqa
         except Exception as exc:  # thrift.py run() throws base Exception
-            if (
-                "firmware requires subsystem reset"
-                or "firmware requires any controller reset" in str(exc)
-            ):
+            msg = str(exc)
+            if _FW_RESET_REQUIRED_PATTERN.search(msg):
                 AutovalLog.log_info(
                     "Activation firmware is successful, but required reset"
                 )
             else:
-                AutovalLog.log_info("Unknown exception occured: %s" % exc)
+                AutovalLog.log_info("Unknown exception occured: %s" % msg)
+        self.refresh_nvme_id_ctrl()
+        self.refresh_smart_log()
+        NVMeUtils.invalidate_nvme_list(self.host)
         if not nvme_admin_io:
             self.post_fw_activate()
 
@@ -999,7 +1237,7 @@ class NVMeDrive(Drive):
         By default since midnight, 01-Jan-1970, UTC
         """
         out = self.get_feature(feature_id=["0xe"])
-        match = re.search(r"The timestamp is\s+:\s+(\d+)", out[0])
+        match = _VS_TIMESTAMP_PATTERN.search(out[0])
         if match:
             time_ms = float(match.group(1))
             time = int(time_ms / 1000.0)
@@ -1009,21 +1247,52 @@ class NVMeDrive(Drive):
         )
 
     def reset(self) -> None:
+        self.refresh_nvme_id_ctrl()
+        self.refresh_smart_log()
+        NVMeUtils.invalidate_nvme_list(self.host)
         drive_name = self.get_drive_name()
         if self.subsystem_reset_models and self.model in self.subsystem_reset_models:
             self.subsystem_reset(drive_name)
         else:
-            if self.get_fw_update_reset_req_models():
+            fw_update_reset_req = self.get_fw_update_reset_req_models()
+            if fw_update_reset_req:
                 sleep_time = 30
             else:
                 sleep_time = 10
             out = self.host.run(
                 cmd="nvme reset /dev/%s" % drive_name, ignore_status=True
             )
-            if "dropped connection" in out:
+            dropped_connection = "dropped connection" in out
+            if dropped_connection:
                 sleep_time += 5
-            AutovalLog.log_info(f"Waiting for {sleep_time} secs after the reset")
-            sleep(sleep_time)
+            # No polling over a connection that was just dropped
+            if fw_update_reset_req or dropped_connection:
+                AutovalLog.log_info(f"Waiting for {sleep_time} secs after the reset")
+                sleep(sleep_time)
+            else:
+                AutovalLog.log_info(
+                    f"Waiting up to {sleep_time} secs for {drive_name} after the reset"
+                )
+                self._wait_for_controller_live(drive_name, sleep_time)
+
+    def _wait_for_controller_live(self, drive_name: str, timeout: float) -> None:
+        """
+        Wait until the controller sysfs state is live again after a reset
+        and the namespace block device is back from the rescan, at least
+        RESET_READY_MIN_WAIT and at most timeout seconds
+        """
+        sleep(RESET_READY_MIN_WAIT)
+        polls = max(
+            int((timeout - RESET_READY_MIN_WAIT) / RESET_READY_POLL_INTERVAL), 1
+        )
+        state_file = f"/sys/class/nvme/{drive_name}/state"
+        # Poll on the DUT so the whole wait is a single host.run round trip
+        cmd = (
+            f"for _ in $(seq {polls}); do grep -qx live {state_file} && "
+            f"test -b {self._devpath} && break; "
+            f"sleep {RESET_READY_POLL_INTERVAL}; done"
+        )
+        self.host.run(cmd=cmd, ignore_status=True)
 
     def get_fw_update_reset_req_models(self) -> bool:
         """
@@ -1033,6 +1302,7 @@ class NVMeDrive(Drive):
         return self.model in self.fw_update_reset_req_models
 
     def subsystem_reset(self, drive_name) -> None:
+        self.refresh_nvme_id_ctrl()
         AutovalLog.log_info("Waiting for 20 seconds before subsystem-reset")
         sleep(20)
         AutovalLog.log_info("Running subsystem-reset")
@@ -1045,7 +1315,7 @@ class NVMeDrive(Drive):
         Method to commit data and metadata associated
         with given namespaces to nonvolatile media
         """
-        nvme_drive = "/dev/%s" % self.block_name
+        nvme_drive = self._devpath
         cmd = "nvme flush %s" % nvme_drive
         AutovalUtils.validate_no_exception(
             self.host.run,
@@ -1082,6 +1352,8 @@ class NVMeDrive(Drive):
 
         To perform secure erase operation on NVMe drive.
         """
+        self.refresh_smart_log()
+        self.refresh_id_ns()
         return NVMeUtils.format_nvme(self.host, self.block_name, secure_erase_option)
 
     def get_drive_temperature(self) -> int:
@@ -1109,14 +1381,24 @@ class NVMeDrive(Drive):
               When the drive does not support fatal error or
               critical warning more than zero.
         """
-        pci_addr = PciUtils().get_nvme_drive_pcie_address(self.host, self.block_name)
+        pci_utils = PciUtils()
+        pci_addr = pci_utils.get_nvme_drive_pcie_address(self.host, self.block_name)
         cmd = "-s " + pci_addr + " -vvv"
-        out = PciUtils().get_lspci_output(self.host, options=cmd)
-        # Search Fatal and FatalErr it output & validate it was set
-        pattern = re.search(r"\s+(Fatal\-|Fatal\+|FatalErr\-|FatalErr\+)", out)
-        if pattern:
-            output = pattern.group(1).strip()
-            if output == "Fatal-" or output == "FatalErr-":
+        out = pci_utils.get_lspci_output(self.host, options=cmd)
+        # Pick the first Fatal/FatalErr and UnsuppReg flags in one pass
+        fatal_flag = None
+        unsupp_flag = None
+        for match in _LSPCI_ERROR_FLAGS_PATTERN.finditer(out):
+            flag = match.group(1)
+            if flag.startswith("Fatal"):
+                fatal_flag = fatal_flag or flag
+            else:
+                unsupp_flag = unsupp_flag or flag
+            if fatal_flag and unsupp_flag:
+                break
+        # Validate Fatal and FatalErr was set
+        if fatal_flag:
+            if fatal_flag == "Fatal-" or fatal_flag == "FatalErr-":
                 AutovalUtils.validate_condition(
                     False,
                     "Fatal/FatalErr has not set in lspci output, check the drive %s"
@@ -1136,11 +1418,9 @@ class NVMeDrive(Drive):
                 component=COMPONENT.STORAGE_DRIVE,
                 error_type=ErrorType.PCIE_ERR,
             )
-        # Search UnsuppReg in uncorrectable error status & validate it was set
-        pattern = re.search(r"\s+(UnsuppReg\-|UnsuppReg\+|UnsupReg\-|UnsupReg\+)", out)
-        if pattern:
-            output = pattern.group(1).strip()
-            if output == "UnsuppReg-" or output == "UnsupReg-":
+        # Validate UnsuppReg in uncorrectable error status was set
+        if unsupp_flag:
+            if unsupp_flag == "UnsuppReg-" or unsupp_flag == "UnsupReg-":
                 AutovalLog.log_info(
                     "Warning - UnsuppReg has not set in lspci output, check the drive %s"
                     % self.block_name
@@ -1150,8 +1430,7 @@ class NVMeDrive(Drive):
                 "Warning: Did not find UnsuppReg in lspci output, check the drive %s"
                 % self.block_name
             )
-        smart_log = self.get_smart_log()
-        critical_warning = smart_log["smart-log"]["critical_warning"]
+        critical_warning = self._get_smart_log_field("critical_warning")
         if critical_warning > 0:
             raise TestError(
                 f"The {self.manufacturer} drive {self.serial_number}"
@@ -1177,7 +1456,7 @@ class NVMeDrive(Drive):
                 500,
                 raise_on_fail=False,
                 log_on_pass=False,
-                msg=f"/dev/{self.block_name}: User-data Erase Count delta",
+                msg=f"{self._devpath}: User-data Erase Count delta",
                 component=COMPONENT.STORAGE_DRIVE,
                 error_type=ErrorType.DRIVE_ERR,
             )
@@ -1213,9 +1492,8 @@ class NVMeDrive(Drive):
         TestError
               When the drive firmware version is not as expected.
         """
-        pattern = r"(?i)^error.*$"
         firmware = self.get_firmware_version().lower()
-        match = re.match(pattern, firmware)
+        match = _DEGRADED_FIRMWARE_PATTERN.match(firmware)
         if match:
             raise TestError(
                 f"The {self.manufacturer} drive {self.serial_number} found degraded.",
@@ -1225,15 +1503,15 @@ class NVMeDrive(Drive):
 
     def get_fw_slots(self) -> List[int]:
         """Get available FW slots"""
-        nvme_drive = "/dev/%s" % self.block_name
+        nvme_drive = self._devpath
         out = self.get_nvme_id_ctrl(human_readable=True)
-        match = re.search(r"(0x\d)\s+Number of Firmware Slots", out)
+        match = _FW_SLOTS_PATTERN.search(out)
         if match:
             slots = list(range(int(match.group(1), 16)))
         else:
             return [0]
         # Remove read-only slot from list if exists
-        match2 = re.search(r"(0x\d)\s+Firmware Slot\s.*\sRead-Only", out)
+        match2 = _FW_SLOT_READ_ONLY_PATTERN.search(out)
         if match2:
             slot = int(match2.group(1), 16)
             AutovalLog.log_info(
@@ -1257,12 +1535,11 @@ class NVMeDrive(Drive):
         :rtype: list
         """
         out = self.get_nvme_id_ctrl()
-        match = re.findall(r"ps\s+(\d+)\s+:\s+.*W\s+operational\s+.*", out)
-        drive_supported_power_modes = [int(val) for val in match]
+        drive_supported_power_modes = list(map(int, _POWER_MODE_PATTERN.findall(out)))
         AutovalUtils.validate_greater(
             len(drive_supported_power_modes),
             0,
-            f"Number of supported power mode {drive_supported_power_modes} for drive /dev/{self.block_name}",
+            f"Number of supported power mode {drive_supported_power_modes} for drive {self._devpath}",
             component=COMPONENT.STORAGE_DRIVE,
             error_type=ErrorType.DRIVE_ERR,
         )
@@ -1271,40 +1548,33 @@ class NVMeDrive(Drive):
     def get_power_state_change_counter(self) -> int:
         """Get Power State Change Counter.
         This method gets the Power State Change Counter value from Log page LID=0xC0h (Bytes 299:292)
-        by issuing nvme get-log <device>  -i 0xc0
-        and extract the Power State Change counter value from std_out.
-        cmd = nvme get-log /dev/nvme1n1 --log-id=0xC0h --log-len=299
-        Sample return value in this case would be : 9876543
+        by issuing nvme get-log <device>  -i 0xc0 in raw binary
+        and dumping only the counter bytes with od.
+        cmd = nvme get-log /dev/nvme1n1 --log-id=0xC0h --log-len=300 --raw-binary
+              | od -An -tx1 -v -j292 -N8
+        Sample output " 03 04 05 06 07 08 09 00" would return
+        0x09080706050403 as the counter is a little endian integer
         """
 
         # Command to get Power state change counter (PSCC)
-        cmd = f"nvme get-log /dev/{self.block_name} --log-id=0xC0h --log-len=299"
-        out = self.host.run(cmd=cmd)  # noqa
-
-        # save PSCC value
-        for line in out.splitlines():
-            match = re.search(r"^0120:\s.*\b", line)
-
-        # match = <re.Match object; span=(0, 38), match='0120: 00 00 01 02 03 04 05 06 07 08 09'>
-        # to extract PSSC from match
-        power_state_change_count_value = match.group(0)
-
-        # To extract PSSC value from bytes 292:299
-        power_state_change_count_value = list(
-            power_state_change_count_value.split(" ")[5:]
+        cmd = (
+            f"nvme get-log {self._devpath} --log-id=0xC0h --log-len=300 "
+            "--raw-binary | od -An -tx1 -v -j292 -N8"
         )
-        # convert char to int
-        power_state_change_count_value = [
-            int(item) for item in power_state_change_count_value
-        ]
-        # reverse the bytes to read the PSSC value [3, 4, 5, 6, 7, 8, 9] -->[9, 8, 7, 6, 5, 4, 3]
-        power_state_change_count_value.reverse()
-        # convert this into int number - 9876543
-        strings = [str(integer) for integer in power_state_change_count_value]
-        a_string = "".join(strings)
-        power_state_change_count_value = int(a_string)
+        out = self.host.run(cmd=cmd)  # noqa
+        try:
+            counter_bytes = bytes.fromhex("".join(out.split()))
+        except ValueError:
+            # Anything but the od byte dump, e.g. an nvme-cli error message
+            counter_bytes = b""
+        if not counter_bytes:
+            raise TestError(
+                f"Power state change counter not found for {self.block_name}",
+                component=COMPONENT.STORAGE_DRIVE,
+                error_type=ErrorType.NVME_ERR,
+            )
+        power_state_change_count_value = int.from_bytes(counter_bytes, "little")
         AutovalLog.log_info(power_state_change_count_value)
-        # sample return value would be - 9876543
         return power_state_change_count_value
 
     def get_power_mode(self) -> int:
@@ -1325,9 +1595,9 @@ class NVMeDrive(Drive):
             When fails to match the get-feature output with the
             given pattern.
         """
-        cmd = "nvme get-feature /dev/%s -f 0x2" % self.block_name
+        cmd = f"nvme get-feature {self._devpath} -f 0x2"
         out = self.host.run(cmd=cmd)  # noqa
-        match = re.search(r"value:\s*(\S+)", out)
+        match = _FEATURE_VALUE_PATTERN.search(out)
         if match:
             return int(match.group(1), 16)
         raise TestError(
@@ -1358,12 +1628,9 @@ class NVMeDrive(Drive):
             - When the power mode is not supported by the drive.
         """
 
-        cmd = "nvme set-feature /dev/%s -f 0x2 -v %s" % (
-            self.block_name,
-            feature_value,
-        )
+        cmd = f"nvme set-feature {self._devpath} -f 0x2 -v {feature_value}"
         out = self.host.run(cmd=cmd)  # noqa
-        match = re.search(r"value:\s*(\S+)", out)
+        match = _FEATURE_VALUE_PATTERN.search(out)
         if match:
             if int(match.group(1), 16) == feature_value:
                 return feature_value
@@ -1411,7 +1678,7 @@ class NVMeDrive(Drive):
             )
         out = NVMeUtils.run_nvme_security_recv_cmd(self.host, self.block_name)
         # https://trustedcomputinggroup.org/wp-content/uploads/TCG_Storage_Architecture_Core_Spec_v2.01_r1.00.pdf
-        match = re.search(r"04\s02\s\S{2}\s\S{2}\s(\S{2})\s", out)
+        match = _SID_STATE_PATTERN.search(out)
         # looking for the feature code 0402 to identify the c_pin
         if match:
             byte_0xA8_int = int(match.group(1))
@@ -1472,6 +1739,7 @@ class NVMeDrive(Drive):
         )
 
     def validate_io_command_timer(self, io_command_timer_after, command_timer_before):
+        # The IO probe runs after the admin probe, so this covers both
         io_completion_timer = io_command_timer_after - command_timer_before
         AutovalUtils.validate_less(
             io_completion_timer,
@@ -1483,7 +1751,7 @@ class NVMeDrive(Drive):
 
     def check_admin_command_success(self, admin_command):
         new_fw_ver = self.get_nvme_id_ctrl_fw_revision()
-        match = re.search(r"fr\s+:\s+(.*)", admin_command)
+        match = _FW_REVISION_PATTERN.search(admin_command)
         fw_version = str(match.group(1))
         AutovalUtils.validate_equal(
             fw_version,
@@ -1530,6 +1798,9 @@ class NVMeDrive(Drive):
         """Returns True if drive model-firmware combination is suitable for OCP 2.0 LM parsing"""
         if self.model in self.lmparser_ocp_2_0_drives.get("AnyFW", []):
             return True
+        # Only read the firmware version when some entry is firmware specific
+        if not self.lmparser_ocp_2_0_drives.keys() - {"AnyFW"}:
+            return False
         fw_ver = self.get_firmware_version()
         if fw_ver in self.lmparser_ocp_2_0_drives:
             if self.model in self.lmparser_ocp_2_0_drives[fw_ver]:
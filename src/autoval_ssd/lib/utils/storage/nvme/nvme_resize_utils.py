@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 
 # pyre-unsafe
+import bisect
 import re
+import threading
 import time
 from enum import Enum
 
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, NoReturn, Optional, Pattern, Tuple, Union
 
 from autoval.lib.host.component.component import COMPONENT
 from autoval.lib.host.host import Host
+from autoval.lib.utils.async_utils import AsyncJob, AsyncUtils
 from autoval.lib.utils.autoval_errors import ErrorType
 from autoval.lib.utils.autoval_exceptions import TestError
 from autoval.lib.utils.autoval_log import AutovalLog
@@ -19,6 +22,40 @@ from autoval_ssd.lib.utils.storage.nvme.nvme_utils import NVMeUtils
 
 BYTES_PER_TB = 1000**4
 CAPACITIES = [int(1.8 * BYTES_PER_TB), int(3.6 * BYTES_PER_TB)]
+# Wait after attach-ns. When polling for the namespace, the quiet period
+# before the first poll and the interval between two polls
+ATTACH_NS_WAIT = 10
+ATTACH_NS_MIN_WAIT = 3
+ATTACH_NS_POLL_INTERVAL = 0.5
+# IDEMA LBA count of a 50 GB drive and LBAs per additional GB, by block size
+_IDEMA_LBA_COUNTS = {4096: (12212046, 244188), 512: (97696368, 1953504)}
+# ctratt bit of controllers reporting the namespace granularity list
+_CTRATT_NS_GRANULARITY = 1 << 7
+# Block size in bytes of the supported lbads values
+_LBADS_TO_BLOCK_SIZE = {9: 512, 12: 4096}
+# Namespace supporting block names and controller to namespace map,
+# keyed by hostname and sorted block names
+_NAMESPACE_DRIVES_CACHE: Dict[Tuple[str, Tuple[str, ...]], Tuple[List, Dict]] = {}
+
+
+class _SharedNvmeList:
+    """
+    nvme list output shared by the ns_resize threads of one host. A run is
+    reused only by callers whose namespace change finished before it started
+    """
+
+    def __init__(self, host) -> None:
+        self._host = host
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self._out: Optional[str] = None
+
+    def get(self, not_before: float) -> str:
+        with self._lock:
+            if self._out is None or self._started < not_before:
+                self._started = time.monotonic()
+                self._out = self._host.run("nvme list")
+            return self._out
 
 
 class NvmeResizeUtil:
@@ -35,19 +72,21 @@ class NvmeResizeUtil:
         amount of user capacity
         """
 
-        usercapacity = {"_to_usercapacity": lambda x, max_bytes: x}
-        round_to_usercapacity = {
-            "_to_usercapacity": lambda x, max_bytes: CAPACITIES[
+        # Member values are one element tuples holding the converter, a
+        # plain function would become a method instead of a member
+        usercapacity = (lambda x, max_bytes: x,)
+        round_to_usercapacity = (
+            lambda x, max_bytes: CAPACITIES[
                 NvmeResizeUtil.get_index_of_closest_capacity(max_bytes)
-            ]
-        }
-        overprovisioning = {"_to_usercapacity": lambda x, max_bytes: max_bytes - x}
+            ],
+        )
+        overprovisioning = (lambda x, max_bytes: max_bytes - x,)
 
         def to_usercapacity(self, num_bytes: int, max_bytes: int) -> int:
             """
             Utility method to convert sweep_param_key value to usercapacity
             """
-            return int(self.value["_to_usercapacity"](num_bytes, max_bytes))
+            return int(self.value[0](num_bytes, max_bytes))
 
     class SweepParamUnitEnum(Enum):
         """
@@ -55,9 +94,9 @@ class NvmeResizeUtil:
         This param allows user to specify size in bytes, percentage etc
         """
 
-        percent = {"_to_bytes": lambda x, max_bytes: x * max_bytes / 100}
-        num_bytes = {"_to_bytes": lambda x, max_bytes: x}
-        num_TB = {"_to_bytes": lambda x, max_bytes: x * BYTES_PER_TB}
+        percent = (lambda x, max_bytes: x * max_bytes / 100,)
+        num_bytes = (lambda x, max_bytes: x,)
+        num_TB = (lambda x, max_bytes: x * BYTES_PER_TB,)
 
         def to_bytes(
             self,
@@ -67,11 +106,7 @@ class NvmeResizeUtil:
             """
             Utility method to convert sweep_param_key to number of bytes
             """
-            num_bytes = self.value["_to_bytes"](
-                sweep_param_value,
-                max_bytes,
-            )
-            return int(num_bytes)
+            return int(self.value[0](sweep_param_value, max_bytes))
 
     @staticmethod
     def validate_num_bytes_less_equal_max_bytes(num_bytes: int, max_bytes: int) -> None:
@@ -91,7 +126,15 @@ class NvmeResizeUtil:
         """
         Utility method to get index of closest capacity to num_bytes
         """
-        return min(range(len(CAPACITIES)), key=lambda i: abs(CAPACITIES[i] - max_bytes))
+        # CAPACITIES is sorted, only the two neighbours of max_bytes can be closest
+        index = bisect.bisect_left(CAPACITIES, max_bytes)
+        if index == 0:
+            return 0
+        if index == len(CAPACITIES):
+            return index - 1
+        if max_bytes - CAPACITIES[index - 1] <= CAPACITIES[index] - max_bytes:
+            return index - 1
+        return index
 
     @staticmethod
     def get_idema_lba_counts(num_bytes, block_size: int) -> int:
@@ -100,9 +143,8 @@ class NvmeResizeUtil:
         Ref: IDEMA Document LBA1-03
         """
         num_GB = num_bytes / (1000**3)
-        if block_size == 4096:
-            return int(12212046 + (244188 * (num_GB - 50)))
-        return int(97696368 + (1953504 * (num_GB - 50)))
+        base, per_GB = _IDEMA_LBA_COUNTS.get(block_size, _IDEMA_LBA_COUNTS[512])
+        return int(base + (per_GB * (num_GB - 50)))
 
     @staticmethod
     def get_flag(host, device: str, flag_name: str, flag_regex: str) -> int:
@@ -112,11 +154,49 @@ class NvmeResizeUtil:
         @return lbadss_flag
         @return flbas_flag
         """
-        cmd = "nvme id-ns -n 1 /dev/%s | grep 'in use'" % device
-        out = host.run(cmd)
-        match = re.search(flag_regex, out)
+        out = NvmeResizeUtil._get_inuse_lbaf_line(host, device)
+        return NvmeResizeUtil._parse_flag(
+            out, device, flag_name, re.compile(flag_regex)
+        )
+
+    @staticmethod
+    def get_inuse_lbaf(host, device: str) -> Tuple[int, int]:
+        """
+        Determine lbads and flbas of the currently in use lbaf with a
+        single nvme id-ns json call on the device
+        @return (lbads_flag, flbas_flag)
+        """
+        id_ns = NVMeUtils.get_id_ns(host, device, nsid=1)
+        try:
+            flbas = id_ns["flbas"]
+        except KeyError:
+            NvmeResizeUtil._raise_flag_not_found(device, "flbas")
+        # Format index, bits 3:0 with the upper bits 6:5 for more than 16 formats
+        lbaf = (flbas & 0xF) | ((flbas & 0x60) >> 1)
+        try:
+            lbads = id_ns["lbafs"][lbaf]["ds"]
+        except (KeyError, IndexError):
+            NvmeResizeUtil._raise_flag_not_found(device, "lbads")
+        return lbads, lbaf
+
+    @staticmethod
+    def _get_inuse_lbaf_line(host, device: str) -> str:
+        """Return the in use lbaf line of nvme id-ns, filtered here
+        rather than by a grep process on the DUT"""
+        out = host.run("nvme id-ns -n 1 /dev/%s" % device)
+        return next((line for line in out.splitlines() if "in use" in line), "")
+
+    @staticmethod
+    def _parse_flag(
+        out: str, device: str, flag_name: str, flag_pattern: Pattern
+    ) -> int:
+        match = flag_pattern.search(out)
         if match:
             return int(match.group(1))
+        NvmeResizeUtil._raise_flag_not_found(device, flag_name)
+
+    @staticmethod
+    def _raise_flag_not_found(device: str, flag_name: str) -> NoReturn:
         raise TestError(
             f"Failed to find {flag_name} flag for drive in {device}",
             component=COMPONENT.STORAGE_DRIVE,
@@ -131,6 +211,8 @@ class NvmeResizeUtil:
         sweep_param_key: SweepParamKeyEnum,
         device: str,
         sweep_param_value: Union[int, float],
+        nvme_list: Optional[_SharedNvmeList] = None,
+        poll_attach_ns: bool = False,
         **kwargs: Dict[Any, Any],
     ) -> None:
         """
@@ -146,6 +228,11 @@ class NvmeResizeUtil:
             sweep_param_key (SweepParamKeyEnum): The key of the sweep parameter value.
             device (str): The path to the NVMe drive.
             sweep_param_value (Union[int, float]): The value of the sweep parameter.
+            nvme_list (Optional[_SharedNvmeList]): nvme list shared with the other
+                resize threads for the deletion check, run directly when None.
+            poll_attach_ns (bool): Continue as soon as the attached namespace
+                shows in sysfs, after at least ATTACH_NS_MIN_WAIT seconds,
+                instead of always waiting ATTACH_NS_WAIT seconds.
             kwargs (Dict[Any, Any]): Additional keyword arguments.
         Returns:
             None
@@ -158,13 +245,13 @@ class NvmeResizeUtil:
         tnvmcap = None
         nsze = None
         ncap = None
-        block_size = 0
         try:
-            cntlid = nvme_id_ctrls[device]["cntlid"]
-            tnvmcap = nvme_id_ctrls[device]["tnvmcap"]
+            nvme_id_ctrl = nvme_id_ctrls[device]
+            cntlid = nvme_id_ctrl["cntlid"]
+            tnvmcap = nvme_id_ctrl["tnvmcap"]
             if sweep_param_value == 0:
-                nsze = nvme_id_ctrls[device]["orig_nsze"]
-                ncap = nvme_id_ctrls[device]["orig_ncap"]
+                nsze = nvme_id_ctrl["orig_nsze"]
+                ncap = nvme_id_ctrl["orig_ncap"]
                 AutovalLog.log_info(
                     f"Cleanup {device} using ns size before test {ncap} & {nsze}"
                 )
@@ -174,35 +261,28 @@ class NvmeResizeUtil:
                 component=COMPONENT.STORAGE_DRIVE,
                 error_type=ErrorType.NVME_ERR,
             )
-        lbads_flag_value = NvmeResizeUtil.get_flag(
-            host, device, "lbads", r"lbads:(\d+)"
-        )
-        flbas_flag = NvmeResizeUtil.get_flag(host, device, "flbas", r"lbaf  (\d+)")
-        if lbads_flag_value == 12:
-            block_size = 4096
-        elif lbads_flag_value == 9:
-            block_size = 512
+        # Validate the requested size from id-ctrl before touching the drive
         num_bytes = 0
         if sweep_param_unit:
             num_bytes = sweep_param_unit.to_bytes(sweep_param_value, tnvmcap)
         num_bytes = sweep_param_key.to_usercapacity(num_bytes, tnvmcap)
         NvmeResizeUtil.validate_num_bytes_less_equal_max_bytes(num_bytes, tnvmcap)
+        lbads_flag_value, flbas_flag = NvmeResizeUtil.get_inuse_lbaf(host, device)
+        block_size = _LBADS_TO_BLOCK_SIZE.get(lbads_flag_value, 0)
         if sweep_param_value != 0:
-            lbads_flag_value = NvmeResizeUtil.get_flag(
-                host, device, "lbads", r"lbads:(\d+)"
-            )
-            if lbads_flag_value == 12:
-                block_size = 4096
-            elif lbads_flag_value == 9:
-                block_size = 512
-            else:
+            if not block_size:
                 raise TestError(
                     f"lbads flag received incorrect value: {lbads_flag_value}",
                     component=COMPONENT.STORAGE_DRIVE,
                     error_type=ErrorType.NVME_ERR,
                 )
             nsze = NvmeResizeUtil.get_idema_lba_counts(num_bytes, block_size)
-            ncap = nsze
+            # Sizes off the drive's granularity fail create-ns on some drives
+            nszegran, ncapgran = NvmeResizeUtil.get_ns_granularity(
+                nvme_id_ctrl, flbas_flag
+            )
+            nsze = NvmeResizeUtil.align_lba_count(nsze, nszegran, block_size)
+            ncap = NvmeResizeUtil.align_lba_count(nsze, ncapgran, block_size)
         nsid = 1
         AutovalUtils.validate_no_exception(
             NVMeUtils.detach_ns,
@@ -218,7 +298,11 @@ class NvmeResizeUtil:
             component=COMPONENT.STORAGE_DRIVE,
             error_type=ErrorType.NVME_ERR,
         )
-        device_was_deleted = device + f"n{nsid}" not in host.run("nvme list")
+        if nvme_list:
+            nvme_list_out = nvme_list.get(not_before=time.monotonic())
+        else:
+            nvme_list_out = host.run("nvme list")
+        device_was_deleted = device + f"n{nsid}" not in nvme_list_out
         AutovalUtils.validate_condition(
             device_was_deleted,
             f"{device}: confirm namespace deletion",
@@ -241,7 +325,10 @@ class NvmeResizeUtil:
         )
         # Introducing sleep to avoid Kernel Panic on the DUT which is caused by
         # attach-ns.
-        time.sleep(10)
+        if poll_attach_ns:
+            NvmeResizeUtil._wait_for_attached_ns(host, device, nsid)
+        else:
+            time.sleep(ATTACH_NS_WAIT)
         AutovalUtils.validate_no_exception(
             NVMeUtils.reset, [host, device], f"{device}: reset"
         )
@@ -260,6 +347,56 @@ class NvmeResizeUtil:
             error_type=ErrorType.NVME_ERR,
         )
 
+    @staticmethod
+    def _wait_for_attached_ns(host, device: str, nsid: int) -> None:
+        """
+        Wait for the attached namespace to show under the controller in
+        sysfs, at least ATTACH_NS_MIN_WAIT and at most ATTACH_NS_WAIT seconds
+        """
+        # Keep the DUT quiet right after attach-ns, the sysfs check does
+        # not open the controller like nvme list does
+        time.sleep(ATTACH_NS_MIN_WAIT)
+        polls = max(
+            int((ATTACH_NS_WAIT - ATTACH_NS_MIN_WAIT) / ATTACH_NS_POLL_INTERVAL), 1
+        )
+        ns_path = f"/sys/class/nvme/{device}/{device}n{nsid}"
+        cmd = (
+            f"for _ in $(seq {polls}); do test -e {ns_path} && break; "
+            f"sleep {ATTACH_NS_POLL_INTERVAL}; done; test -e {ns_path}"
+        )
+        if host.run_get_result(cmd, ignore_status=True).return_code:
+            AutovalLog.log_info(
+                f"{device}: namespace {nsid} not found {ATTACH_NS_WAIT}s after attach-ns"
+            )
+
+    @staticmethod
+    def _get_namespace_drives(host, drives: List) -> Tuple[List[str], Dict]:
+        """
+        Block names of the drives supporting namespace management and their
+        controller to namespace map, shared by get_nvmcap and get_nvme_ctrls
+        until invalidate_cache is called
+        """
+        key = (host.hostname, tuple(sorted(str(drive) for drive in drives)))
+        cached = _NAMESPACE_DRIVES_CACHE.get(key)
+        if cached is None:
+            ns_support_drive_list = NVMeUtils.get_namespace_support_drive_list(
+                host, list(drives)
+            )
+            nvme_char2block_map = NvmeResizeUtil.get_nvme_with_namespace(
+                host, ns_support_drive_list
+            )
+            cached = (
+                [str(drive) for drive in ns_support_drive_list],
+                nvme_char2block_map,
+            )
+            _NAMESPACE_DRIVES_CACHE[key] = cached
+        return list(cached[0]), dict(cached[1])
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Drop the cached namespace drive lookups"""
+        _NAMESPACE_DRIVES_CACHE.clear()
+
     @staticmethod
     def get_nvmcap(host, drives: List[str]) -> List[int]:
         """
@@ -271,15 +408,16 @@ class NvmeResizeUtil:
         Return:
         list: all drive capacity
         """
-        nvmecap = []
-        nvme_supported_drives = NVMeUtils.get_namespace_support_drive_list(host, drives)
-        nvme_char2block_map = NvmeResizeUtil.get_nvme_with_namespace(
-            host, nvme_supported_drives
+        _, nvme_char2block_map = NvmeResizeUtil._get_namespace_drives(host, drives)
+        id_ns_list = AsyncUtils.run_async_jobs(
+            [
+                AsyncJob(
+                    func=NVMeUtils.get_id_ns, args=[host, device], kwargs={"nsid": 1}
+                )
+                for device in nvme_char2block_map
+            ]
         )
-        for device in nvme_char2block_map:
-            id_ns = NVMeUtils.get_id_ns(host, device, nsid=1)
-            nvmecap.append(id_ns["nvmcap"])
-        return nvmecap
+        return [id_ns["nvmcap"] for id_ns in id_ns_list]
 
     @staticmethod
     def get_nvme_ctrls(host, drive_list, nvme_id_ctrl_filter="True"):
@@ -291,8 +429,8 @@ class NvmeResizeUtil:
         Display nvme list before and after resize method
         """
         nvme_id_ctrls = {}
-        ns_support_drive_list = NVMeUtils.get_namespace_support_drive_list(
-            host, drive_list
+        ns_support_drive_list, nvme_char2block_map = (
+            NvmeResizeUtil._get_namespace_drives(host, drive_list)
         )
         AutovalUtils.validate_non_empty_list(
             ns_support_drive_list,
@@ -300,16 +438,30 @@ class NvmeResizeUtil:
             component=COMPONENT.STORAGE_DRIVE,
             error_type=ErrorType.NVME_ERR,
         )
-        nvme_char2block_map = NvmeResizeUtil.get_nvme_with_namespace(
-            host, ns_support_drive_list
+        # The filter is compiled once, the default "True" needs no eval
+        filter_code = None
+        if nvme_id_ctrl_filter.strip() != "True":
+            try:
+                filter_code = compile(nvme_id_ctrl_filter, "<filter>", "eval")
+            except SyntaxError as e:
+                raise TestError(
+                    f"Can't eval {nvme_id_ctrl_filter}: {str(e)}",
+                    component=COMPONENT.STORAGE_DRIVE,
+                    error_type=ErrorType.NVME_ERR,
+                )
+        devices = list(nvme_char2block_map.keys())
+        # id-ctrl and id-ns of all the devices are read concurrently
+        id_data = AsyncUtils.run_async_jobs(
+            [
+                AsyncJob(func=NvmeResizeUtil._get_id_ctrl_and_ns, args=[host, device])
+                for device in devices
+            ]
         )
-        for device in nvme_char2block_map.keys():
-            nvme_id_ctrl = NVMeUtils.get_id_ctrl(host, device)
-            id_ns = NVMeUtils.get_id_ns(host, device, nsid=1)
-            _locals = {"nvme_id_ctrl": nvme_id_ctrl}
-            _globals = {}
+        for device, (nvme_id_ctrl, id_ns) in zip(devices, id_data):
             try:
-                if eval(nvme_id_ctrl_filter, _locals, _globals):
+                if filter_code is None or eval(
+                    filter_code, {"nvme_id_ctrl": nvme_id_ctrl}
+                ):
                     nvme_id_ctrls[device] = nvme_id_ctrl
                     nvme_id_ctrls[device]["orig_ncap"] = id_ns["ncap"]
                     nvme_id_ctrls[device]["orig_nsze"] = id_ns["nsze"]
@@ -328,6 +480,52 @@ class NvmeResizeUtil:
                 )
         return nvme_id_ctrls
 
+    @staticmethod
+    def _get_id_ctrl_and_ns(host, device: str) -> Tuple[Dict, Dict]:
+        """
+        Return the id-ctrl and namespace 1 id-ns of the device, id-ctrl
+        gets the namespace granularity list when the controller has one.
+        The granularity is best effort, a failed lookup leaves it out
+        """
+        id_ctrl = NVMeUtils.get_id_ctrl(host, device)
+        if id_ctrl.get("ctratt", 0) & _CTRATT_NS_GRANULARITY:
+            try:
+                id_ctrl["ns_granularity"] = NVMeUtils.get_id_ns_granularity(
+                    host, device
+                )
+            except Exception as exc:
+                AutovalLog.log_info(
+                    f"{device}: namespace granularity not available: {exc}"
+                )
+        return id_ctrl, NVMeUtils.get_id_ns(host, device, nsid=1)
+
+    @staticmethod
+    def get_ns_granularity(nvme_id_ctrl: Dict, lbaf: int) -> Tuple[int, int]:
+        """
+        Namespace size and capacity granularity in bytes for the lbaf,
+        (0, 0) when the controller reports none
+        """
+        granularity = nvme_id_ctrl.get("ns_granularity") or {}
+        entries = granularity.get("entry", [])
+        # Bit 0 set maps one descriptor to each LBA format, else 0 applies to all
+        index = lbaf if granularity.get("attributes", 0) & 1 else 0
+        if index >= len(entries):
+            return 0, 0
+        return (
+            int(entries[index].get("nszegran", 0)),
+            int(entries[index].get("ncapgran", 0)),
+        )
+
+    @staticmethod
+    def align_lba_count(lba_count: int, granularity: int, block_size: int) -> int:
+        """
+        Round lba_count down to a multiple of granularity bytes
+        """
+        granularity_lbas = granularity // block_size
+        if granularity_lbas > 1:
+            lba_count -= lba_count % granularity_lbas
+        return lba_count
+
     @staticmethod
     def perform_resize(
         host,
@@ -337,6 +535,7 @@ class NvmeResizeUtil:
         sweep_param_value: Union[int, float],
         nvme_id_ctrl_filter: str = "True",
         cycle=1,
+        poll_attach_ns: bool = False,
     ) -> None:
         """
         This function performs a resize operation on the specified NVMe drives.
@@ -369,20 +568,26 @@ class NvmeResizeUtil:
                 Defaults to "True" to effectively skip using the nvme_id_ctrl_filter
             cycle (int, optional): The number of cycles to perform the resize
                 operation. Defaults to 1.
+            poll_attach_ns (bool, optional): Poll for the namespace after
+                attach-ns instead of the fixed wait. Defaults to False.
 
         Returns:
             None
         """
+        # Namespaces may have changed since the last lookup
+        NvmeResizeUtil.invalidate_cache()
         nvme_id_ctrls = NvmeResizeUtil.get_nvme_ctrls(
             host, drive_list, nvme_id_ctrl_filter=nvme_id_ctrl_filter
         )
-        nvme_ctrls = [*nvme_id_ctrls]  # Device List
         AutovalUtils.validate_non_empty_list(
-            nvme_ctrls,
+            list(nvme_id_ctrls),
             "Usable SSD drives",
             component=COMPONENT.STORAGE_DRIVE,
             error_type=ErrorType.NVME_ERR,
         )
+        # Nothing changes the namespaces between the end of a cycle and the
+        # start of the next, so its nvme list is reused as the next before list
+        nvme_list_out = None
         for _cycle in range(1, cycle + 1):
             AutovalLog.log_info(f"Starting cycle {_cycle}")
             if sweep_param_value:
@@ -393,9 +598,12 @@ class NvmeResizeUtil:
                 AutovalLog.log_info(
                     f"Before resizing with sweep param key {sweep_param_key}"
                 )
-            AutovalLog.log_info("NVME LIST\n" + host.run("nvme list"))
+            if nvme_list_out is None:
+                nvme_list_out = host.run("nvme list")
+            AutovalLog.log_info("NVME LIST\n" + nvme_list_out)
             ns_validate_queue = []
-            for device in nvme_ctrls:
+            nvme_list = _SharedNvmeList(host)
+            for device in nvme_id_ctrls:
                 ns_validate_queue.append(
                     AutovalThread.start_autoval_thread(
                         NvmeResizeUtil.ns_resize,
@@ -405,6 +613,8 @@ class NvmeResizeUtil:
                         sweep_param_key,
                         device,
                         sweep_param_value,
+                        nvme_list=nvme_list,
+                        poll_attach_ns=poll_attach_ns,
                     )
                 )
             if len(ns_validate_queue):
@@ -417,7 +627,10 @@ class NvmeResizeUtil:
                 AutovalLog.log_info(
                     f"After resizing with sweep param key {sweep_param_key}"
                 )
-            AutovalLog.log_info("NVME LIST\n" + host.run("nvme list"))
+            nvme_list_out = host.run("nvme list")
+            AutovalLog.log_info("NVME LIST\n" + nvme_list_out)
+        # The resized namespaces are looked up again by later callers
+        NvmeResizeUtil.invalidate_cache()
 
     @staticmethod
     def get_nvme_with_namespace(host, test_drives):
@@ -5,8 +5,9 @@
 import json
 import re
 import time
+import weakref
 from enum import auto, Enum
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from autoval.lib.utils.autoval_exceptions import TestError
 from autoval.lib.utils.autoval_log import AutovalLog
@@ -16,6 +17,24 @@ from autoval.lib.utils.autoval_utils import AutovalUtils
 if TYPE_CHECKING:
     from autoval.lib.host.host import Host
 
+# Seconds for which an nvme list read is reused by get_nvme_list
+NVME_LIST_CACHE_TIMEOUT = 2
+
+# Matches nvme block device (e.g. nvme1), character device (e.g. nvme1n1) or
+# nvme partition (e.g. nvme1n2p1)
+_NVME_DEVICE_PATTERN = re.compile(
+    r"nvme(?P<ctrlnum>\d+)(n(?P<nsid>\d+)(p(?P<partid>\d+)?)?)?$"
+)
+_NVME_VERSION_PATTERN = re.compile(r"\d+\.\d+.*")
+_NVME_NAME_PATTERN = re.compile(r"(nvme\d*)")
+_NVME_CTRL_PATTERN = re.compile(r"(nvme\d+)")
+_DEVICE_PATH_PATTERN = re.compile(r"^/dev/(\w+)")
+_WRITE_CACHE_VALUE_PATTERN = re.compile(r"Current value:\s*((0x)?[0-9]+)")
+_NSID_PATTERN = re.compile(r"\[\s+\d+\]:(0x.*)")
+_TEMPERATURE_PATTERN = re.compile(r"temperature\s+:\s+(\d+)\s+C")
+_NS_MGMT_PATTERN = re.compile(r"\s+NS Management and Attachment Supported")
+_TMT_VALUE_PATTERN = re.compile(r"Current value:((0x)?[0-9a-f]+)")
+
 
 class NVMeDeviceEnum(Enum):
     """Class for NVME drives enumeration"""
@@ -29,6 +48,12 @@ class NVMeDeviceEnum(Enum):
 class NVMeUtils:
     """Class for NVME drives"""
 
+    # Last nvme list read per host, as (read time, devices). Weak keys so a
+    # recycled host object never picks up another host's drives.
+    _nvme_list_cache: "weakref.WeakKeyDictionary[object, Tuple[float, List[Dict]]]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     @staticmethod
     def get_nvme_device_type(device_name: str) -> NVMeDeviceEnum:
         """
@@ -37,12 +62,7 @@ class NVMeUtils:
             eg nvme1n1p1
         @return dictionary of id-ctrl output
         """
-        # Matches nvme block device (e.g. nvme1), character device (e.g. nvme1n1) or
-        # nvme partition (e.g. nvme1n2p1)
-        nvme_dev_re = re.compile(
-            r"nvme(?P<ctrlnum>\d+)(n(?P<nsid>\d+)(p(?P<partid>\d+)?)?)?$"
-        )
-        match = nvme_dev_re.match(device_name)
+        match = _NVME_DEVICE_PATTERN.match(device_name)
         if match:
             if match.group("nsid") is None:
                 return NVMeDeviceEnum.CHARACTER
@@ -64,6 +84,19 @@ class NVMeUtils:
         id_ctrl = AutovalUtils.loads_json(ret.stdout)
         return id_ctrl
 
+    @staticmethod
+    def get_id_ns_granularity(host, char_name: str) -> Dict:
+        """
+        Return the namespace granularity list, only reported by controllers
+        with the namespace granularity bit of ctratt set
+        @param Host : host
+        @param String char_name: e.g. nvme1
+        @return {} dictionary of id-ns-granularity output
+        """
+        cmd = f"nvme id-ns-granularity /dev/{char_name} -o json"
+        ret = host.run_get_result(cmd)
+        return AutovalUtils.loads_json(ret.stdout)
+
     @staticmethod
     def get_id_ctrl_normal_data(host, device_name: str) -> str:
         """This function will give the controller info output in a normal format
@@ -126,7 +159,7 @@ class NVMeUtils:
     def get_nvme_version(host) -> str:
         """Return NVME version"""
         out = host.run("nvme version")
-        match = re.search(r"\d+\.\d+.*", out)
+        match = _NVME_VERSION_PATTERN.search(out)
         if match:
             return match.group(0)
         raise TestError("nvme version not detected: %s" % out)
@@ -139,26 +172,56 @@ class NVMeUtils:
             { "DevicePath" : "/dev/nvme0n1", "ModelNumber": "...", ... },
             { "DevicePath" : "/dev/nvme1n1", "ModelNumber": "...", ... }
         ]
-        """
+        The result is reused for NVME_LIST_CACHE_TIMEOUT seconds, commands
+        that change the namespaces drop it through invalidate_nvme_list.
+        Every caller gets its own copy of the entries.
+        """
+        cached = NVMeUtils._nvme_list_cache.get(host)
+        if cached and time.monotonic() - cached[0] < NVME_LIST_CACHE_TIMEOUT:
+            return [dict(entry) for entry in cached[1]]
+        started = time.monotonic()
         ret = host.run_get_result("nvme list -o json")
-        nvme_list = json.loads(ret.stdout)
-        return nvme_list["Devices"]
+        devices = json.loads(ret.stdout)["Devices"]
+        NVMeUtils._nvme_list_cache[host] = (started, devices)
+        return [dict(entry) for entry in devices]
 
     @staticmethod
-    def get_from_nvme_list(host, block_name, field):
+    def invalidate_nvme_list(host) -> None:
+        """Drop the cached nvme list of the host so the next read is fresh"""
+        NVMeUtils._nvme_list_cache.pop(host, None)
+
+    @staticmethod
+    def get_nvme_list_entry(host, block_name):
         """
         @param String block_name: e.g. nvme1n1
-        @param String field: field to update
-        @return String: value of given field
+        @return {}: nvme list entry of the given drive
         """
         nvme_list = NVMeUtils.get_nvme_list(host)
         path = "/dev/%s" % block_name
-        try:
-            drive_data = [dr for dr in nvme_list if dr["DevicePath"] == path].pop()
-        except IndexError:
+        entry = next((dr for dr in nvme_list if dr["DevicePath"] == path), None)
+        if entry is None:
             raise TestError(
                 "Unable to find DevicePath for %s in %s" % (block_name, nvme_list)
             )
+        return entry
+
+    @staticmethod
+    def get_from_nvme_list(host, block_name, field):
+        """
+        @param String block_name: e.g. nvme1n1
+        @param String field: field to update
+        @return String: value of given field
+        """
+        drive_data = NVMeUtils.get_nvme_list_entry(host, block_name)
+        return NVMeUtils.get_nvme_list_field(drive_data, field)
+
+    @staticmethod
+    def get_nvme_list_field(drive_data: Dict, field):
+        """
+        @param {} drive_data: nvme list entry of a drive
+        @param String field: field to update
+        @return String: value of given field
+        """
         if field not in drive_data:
             raise TestError("Unable to find %s in %s" % (field, drive_data))
         if isinstance(drive_data[field], str):
@@ -175,13 +238,13 @@ class NVMeUtils:
         nvme_info = {}
         namespaces = []
         drives = NVMeUtils.get_nvme_list(host)
-        match = re.search(r"(nvme\d*)", blockname)
+        match = _NVME_NAME_PATTERN.search(blockname)
         if match:
             nvme_drive = match.group(1)
         else:
             raise TestError("NVME drives not found: %s" % drives)
         for drive in drives:
-            match = re.search(r"^/dev/(\w+)", drive["DevicePath"])
+            match = _DEVICE_PATH_PATTERN.search(drive["DevicePath"])
             if match:
                 n_s = match.group(1)
                 if serial_number in drive["SerialNumber"]:
@@ -207,6 +270,7 @@ class NVMeUtils:
             timeout = 36100  # 10 hours noqa
         AutovalLog.log_info("Running command: %s" % cmd)
         host.run(cmd=cmd, timeout=timeout)  # noqa
+        NVMeUtils.invalidate_nvme_list(host)
 
     @staticmethod
     def get_nvme_temperature(host, devices):
@@ -226,7 +290,7 @@ class NVMeUtils:
         """
         # Remove namespace
         device = drive
-        match = re.search(r"(nvme\d+)", str(drive))
+        match = _NVME_CTRL_PATTERN.search(str(drive))
         if match:
             device = match.group(1)
         cmd = "nvme get-feature /dev/%s -f 0x6" % device
@@ -234,7 +298,7 @@ class NVMeUtils:
         # For not supported devices
         if "INVALID_FIELD" in output:
             return None
-        match = re.search(r"Current value:\s*((0x)?[0-9]+)", output)
+        match = _WRITE_CACHE_VALUE_PATTERN.search(output)
         if match:
             return int(match.group(1), 0)
         return None
@@ -247,7 +311,7 @@ class NVMeUtils:
         """
         # Remove namespace
         device = drive
-        match = re.search(r"(nvme\d+)", str(drive))
+        match = _NVME_CTRL_PATTERN.search(str(drive))
         if match:
             device = match.group(1)
         cmd = "nvme set-feature /dev/%s -f 0x6 -v 1" % device
@@ -263,7 +327,7 @@ class NVMeUtils:
         """
         # Remove namespace
         device = drive
-        match = re.search(r"(nvme\d+)", str(drive))
+        match = _NVME_CTRL_PATTERN.search(str(drive))
         if match:
             device = match.group(1)
         cmd = "nvme set-feature /dev/%s -f 0x6 -v 0" % device
@@ -276,7 +340,7 @@ class NVMeUtils:
         """List of all namespaces"""
         cmd = f"nvme list-ns /dev/{device_name}"
         out = host.run(cmd)
-        _list = re.findall(r"\[\s+\d+\]:(0x.*)", out)
+        _list = _NSID_PATTERN.findall(out)
         ns_list = [int(x, 16) for x in _list]
         return ns_list
 
@@ -307,6 +371,7 @@ class NVMeUtils:
         else:
             cmd += f" -n {nsid}"
             host.run(cmd=cmd)
+        NVMeUtils.invalidate_nvme_list(host)
 
     @staticmethod
     def create_ns(host, char_name: str, nsze, ncap, block_size, flbas_flag) -> int:
@@ -328,9 +393,11 @@ class NVMeUtils:
                 "Needs to be character device"
             )
 
-        return host.run(
+        out = host.run(
             f"nvme create-ns -f {flbas_flag} /dev/{char_name} -s {nsze} -c {ncap}"
         )
+        NVMeUtils.invalidate_nvme_list(host)
+        return out
 
     @staticmethod
     def attach_ns(host, char_name: str, nsid, cntlid) -> int:
@@ -348,7 +415,9 @@ class NVMeUtils:
                 f"{char_name} is of type {device_type.value}."
                 "Needs to be character device"
             )
-        return host.run(f"nvme attach-ns /dev/{char_name} -n {nsid} -c {cntlid}")
+        out = host.run(f"nvme attach-ns /dev/{char_name} -n {nsid} -c {cntlid}")
+        NVMeUtils.invalidate_nvme_list(host)
+        return out
 
     @staticmethod
     def detach_ns(host, char_name: str, nsid, cntlid) -> int:
@@ -359,7 +428,9 @@ class NVMeUtils:
                 f"{char_name} is of type {device_type.value}."
                 "Needs to be character device"
             )
-        return host.run(f"nvme detach-ns /dev/{char_name} -n {nsid} -c {cntlid}")
+        out = host.run(f"nvme detach-ns /dev/{char_name} -n {nsid} -c {cntlid}")
+        NVMeUtils.invalidate_nvme_list(host)
+        return out
 
     @staticmethod
     def reset(host, char_name: str) -> None:
@@ -377,6 +448,7 @@ class NVMeUtils:
                 "Needs to be character device"
             )
         out = host.run(cmd=f"nvme reset /dev/{char_name}", ignore_status=True)
+        NVMeUtils.invalidate_nvme_list(host)
         if "dropped connection" in out:
             time.sleep(5)
 
@@ -389,7 +461,7 @@ class NVMeUtils:
         nvme_temp = 0
         cmd = "nvme smart-log /dev/%s" % drive
         out = host.run(cmd)
-        match = re.search(r"temperature\s+:\s+(\d+)\s+C", out)
+        match = _TEMPERATURE_PATTERN.search(out)
         if match:
             nvme_temp = match.group(1)
         return int(nvme_temp)
@@ -481,8 +553,7 @@ class NVMeUtils:
         for drive in drive_list:
             cmd = "nvme id-ctrl /dev/%s -H | grep -v fguid" % drive
             out = host.run_get_result(cmd).stdout
-            pattern = r"\s+NS Management and Attachment Supported"
-            found_obj = re.search(pattern, out)
+            found_obj = _NS_MGMT_PATTERN.search(out)
             if found_obj:
                 supported_ns_drivelist.append(drive)
         return supported_ns_drivelist
@@ -518,7 +589,7 @@ class NVMeUtils:
         output = host.run(cmd, ignore_status=True)
         if "INVALID_FIELD" in output:
             return None
-        match = re.search(r"Current value:((0x)?[0-9a-f]+)", output)
+        match = _TMT_VALUE_PATTERN.search(output)
         if match:
             return int(match.group(1), 0)
         return None
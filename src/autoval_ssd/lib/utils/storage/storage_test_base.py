@@ -599,13 +599,26 @@ class StorageTestBase(TestBase):
         """
         AutovalLog.log_info("Converting storage data for config check")
         formatted_drive_info = {"hdd": {}, "ssd": {}, "emmc": {}}
-        for each_drive in self.drives:
-            drive_type = str(each_drive.get_type()).lower().split(".")[1]
-            formatted_drive_info[drive_type].update(
-                each_drive.collect_data_in_config_check_format()
-            )
+        data: List[Tuple[str, Dict]] = AsyncUtils.run_async_jobs(
+            [
+                AsyncJob(func=self._collect_drive_config_check_data, args=[drive])
+                for drive in self.drives
+            ]
+        )
+        for drive_type, drive_data in data:
+            formatted_drive_info[drive_type].update(drive_data)
         return formatted_drive_info
 
+    def _collect_drive_config_check_data(self, drive: Drive) -> Tuple[str, Dict]:
+        """
+        Collect one drive's data in config check format
+
+        Returns:
+            Tuple[str, Dict]: drive type key and the drive data
+        """
+        drive_type = str(drive.get_type()).lower().split(".")[1]
+        return drive_type, drive.collect_data_in_config_check_format()
+
     # @Override
     def cleanup(self, *args, **kwargs) -> None:
         self._validate_hdd_drive_count()
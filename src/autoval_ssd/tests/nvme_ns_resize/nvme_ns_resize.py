@@ -37,6 +37,10 @@ class NvmeNSResize(StorageTestBase):
             "nvme_id_ctrl_filter": "nvme_id_ctrl[\"tnvmcap\"] >= 536870912000",
             ...}
         cycle_count: number of times to repeat each test
+        poll_attach_ns: continue as soon as the new namespace shows in sysfs,
+            at least 3 seconds after attach-ns, instead of always waiting
+            10 seconds. Defaults to false,
+            keep it off for firmware that needs the full wait.
     """
 
     def __init__(self, *args, **kwargs) -> None:
@@ -64,6 +68,7 @@ class NvmeNSResize(StorageTestBase):
             "nvme_id_ctrl_filter", "True"
         )
         self.cycle = self.test_control.get("cycle_count", 1)
+        self.poll_attach_ns: bool = self.test_control.get("poll_attach_ns", False)
         # Placehold dictionary to store nvme device to id-ctrl mapping
         self.nvme_id_ctrls = {}
 
@@ -95,6 +100,7 @@ class NvmeNSResize(StorageTestBase):
                     sweep_param_value=sweep_param_value,
                     nvme_id_ctrl_filter=self.nvme_id_ctrl_filter,
                     cycle=self.cycle,
+                    poll_attach_ns=self.poll_attach_ns,
                 )
                 self._fio_setup_after_ns_recreate()
                 self.validate_no_exception(
@@ -155,8 +161,8 @@ class NvmeNSResize(StorageTestBase):
                         sweep_param_value,
                     )
                 )
-                if ns_validate_queue:
-                    AutovalThread.wait_for_autoval_thread(ns_validate_queue)
+            if ns_validate_queue:
+                AutovalThread.wait_for_autoval_thread(ns_validate_queue)
             AutovalLog.log_info(
                 "NVME LIST AFTER CLEANUP\n" + self.host.run("nvme list")
             )
@@ -1,6 +1,7 @@
 # pyre-unsafe
 import copy
 import json
+import time
 import unittest
 import unittest.mock as mock
 from unittest.mock import call, patch
@@ -38,8 +39,9 @@ CMD_MAP = [
     {"cmd": "nvme id-ctrl /dev/nvme1 -H | grep -v fguid", "file": "id_ctrlH"},
     {"cmd": "cat /sys/block/nvme1/queue/rotational", "result": "0"},
     {
-        "cmd": "nvme get-log /dev/nvme1n1 --log-id=0xC0h --log-len=299",
-        "file": "power_state_change_counter",
+        "cmd": "nvme get-log /dev/nvme1n1 --log-id=0xC0h --log-len=300 "
+        "--raw-binary | od -An -tx1 -v -j292 -N8",
+        "result": " 03 04 05 06 07 08 09 00",
     },
     {
         "cmd": "nvme ocp smart-add-log /dev/nvme1 -o json",
@@ -224,21 +226,38 @@ class NvmeDriveUnitTest(unittest.TestCase):
     @apply_mock
     def test_power_state_change_count(self):
         """unit test for get_power_state_change_counter"""
-        # cmd = "nvme get-log /dev/nvme1n1 --log-id=0xC0h --log-len=299"
-        cmd = f"nvme get-log /dev/{self.mock_block_name} --log-id=0xC0h --log-len=299"
-        moc_file = "power_state_change_counter"
-        self.update_cmd_map(cmd, moc_file, True)
+        cmd = (
+            f"nvme get-log /dev/{self.mock_block_name} --log-id=0xC0h --log-len=300 "
+            "--raw-binary | od -An -tx1 -v -j292 -N8"
+        )
+        self.update_cmd_map(cmd, " 03 04 05 06 07 08 09 00")
         out = self.nvme.get_power_state_change_counter()
-        mock_output = 9876543
+        # Bytes 299:292 read as a little endian integer
+        mock_output = 0x09080706050403
         self.assertEqual(out, mock_output)
+        # A log page without the counter bytes gives an empty dump
+        self.addCleanup(self.update_cmd_map, cmd, " 03 04 05 06 07 08 09 00")
+        self.update_cmd_map(cmd, "")
+        self.assertRaises(TestError, self.nvme.get_power_state_change_counter)
+        self.update_cmd_map(cmd, "NVMe status: Invalid Log Page")
+        self.assertRaises(TestError, self.nvme.get_power_state_change_counter)
 
     def test_get_nvme_id_ctrl(self) -> None:
         """unit test for get_nvme_id_ctrl"""
-        cmd = f"nvme id-ctrl /dev/{self.mock_block_name} | grep -v fguid"
-        mock_output = "Pass"
+        cmd = f"nvme id-ctrl /dev/{self.mock_block_name}"
+        mock_output = "vid       : 0x1c5c\nfguid     :\nmtfa      : 250"
         self.update_cmd_map(cmd, mock_output)
         out = self.nvme.get_nvme_id_ctrl()
-        self.assertEqual(out, mock_output)
+        self.assertEqual(out, "vid       : 0x1c5c\nmtfa      : 250")
+        out = self.nvme.get_nvme_id_ctrl(grep="mtfa")
+        self.assertEqual(out, "mtfa      : 250")
+        # The output is cached until it is refreshed
+        self.update_cmd_map(cmd, "mtfa      : 100")
+        self.assertEqual(
+            self.nvme.get_nvme_id_ctrl(), "vid       : 0x1c5c\nmtfa      : 250"
+        )
+        self.nvme.refresh_nvme_id_ctrl()
+        self.assertEqual(self.nvme.get_nvme_id_ctrl(), "mtfa      : 100")
 
     @patch.object(NVMeDrive, "get_nvme_id_ctrl")
     def test_get_nvme_id_ctrl_apsta(self, get_nvme_id_ctrl) -> None:
@@ -259,23 +278,54 @@ class NvmeDriveUnitTest(unittest.TestCase):
 
     def test_get_nvme_id_ctrl_fw_revision(self):
         """unit test for get_nvme_id_ctrl_fw_revision"""
-        cmd = f"nvme id-ctrl /dev/{self.mock_block_name} | grep fr"
+        cmd = f"nvme id-ctrl /dev/{self.mock_block_name}"
         out = """fr        : P1FB006
                     frmw      : 0x2"""
         self.update_cmd_map(cmd, out)
         out = self.nvme.get_nvme_id_ctrl_fw_revision()
         mock_output = "P1FB006"
         self.assertEqual(out, mock_output)
+        # The revision is read from the drive, not the cached id-ctrl output
+        self.update_cmd_map(cmd, "fr        : P1FB007")
+        self.assertEqual(self.nvme.get_nvme_id_ctrl_fw_revision(), "P1FB007")
 
     def test_get_nvme_id_ctrl_mtfa(self):
         """unit test for get_nvme_id_ctrl_mtfa"""
-        cmd = f"nvme id-ctrl /dev/{self.mock_block_name} | grep mtfa"
+        cmd = f"nvme id-ctrl /dev/{self.mock_block_name} -H"
         out = "mtfa      : 250"
         self.update_cmd_map(cmd, out)
         out = self.nvme.get_nvme_id_ctrl_mtfa()
         mock_output = 250
         self.assertEqual(out, mock_output)
 
+    @patch.dict(
+        "autoval_ssd.lib.utils.storage.nvme.nvme_drive._CONFIG_CACHE", clear=True
+    )
+    @patch.object(FileActions, "read_data")
+    def test_load_config(self, mock_read_data):
+        """unit test for load_config"""
+        mock_read_data.return_value = {
+            "nvme": {
+                "smart-log": {"critical_warning": "==", "temperature": "<="},
+                "vs-smart-add-log": {"Refresh Count": "=="},
+            }
+        }
+        self.nvme.smart_log_keys = {"critical_warning": 0, "Refresh Count": 0}.keys()
+        expected = {"critical_warning": "==", "Refresh Count": "=="}
+        self.assertEqual(self.nvme.load_config("nvme_validate.json"), expected)
+        # The parsed config is reused for the next drive
+        self.assertEqual(self.nvme.load_config("nvme_validate.json"), expected)
+        mock_read_data.assert_called_once()
+        self.assertIn("smart-log", mock_read_data.return_value["nvme"])
+        # Statically known smart log keys are used without reading the log
+        self.nvme.smart_log_keys = None
+        with patch.object(
+            NVMeDrive, "STATIC_SMART_LOG_KEYS", frozenset({"temperature"})
+        ), patch.object(NVMeDrive, "get_smart_log") as mock_smart_log:
+            out = self.nvme.load_config("nvme_validate.json")
+        self.assertEqual(out, {"temperature": "<="})
+        mock_smart_log.assert_not_called()
+
     def test_get_nvme_controllers(self):
         """unit test for get_nvme_controllers"""
         cmd = "lspci | grep 'Non-Volatile memory controller:'"
@@ -296,7 +346,7 @@ class NvmeDriveUnitTest(unittest.TestCase):
     @apply_mock
     def test_get_crypto_erase_support_status(self) -> None:
         """unit test for get_crypto_erase_support_status"""
-        cmd = "nvme id-ctrl /dev/nvme1 -H | grep -v fguid"
+        cmd = "nvme id-ctrl /dev/nvme1 -H"
         mock_output_valid = "Mock output with Crypto Erase Supported for the drive"
         mock_output_invalid = "Mock output with Secure Erase Supported for the drive"
         self.update_cmd_map(cmd, mock_output_valid)
@@ -305,6 +355,10 @@ class NvmeDriveUnitTest(unittest.TestCase):
         self.assertTrue(out)
         # Asserting if the return is False in case no Crypto Erase Support
         self.update_cmd_map(cmd, mock_output_invalid)
+        # The id-ctrl output is cached until it is refreshed
+        out = self.nvme.get_crypto_erase_support_status()
+        self.assertTrue(out)
+        self.nvme.refresh_nvme_id_ctrl()
         out = self.nvme.get_crypto_erase_support_status()
         self.assertFalse(out)
 
@@ -326,20 +380,32 @@ class NvmeDriveUnitTest(unittest.TestCase):
         out = self.nvme.get_id_ns()
         self.assertEqual(out, mock_output)
 
+    @apply_mock
+    def test_get_size(self):
+        """unit test for get_size"""
+        cmd = f"nvme id-ns /dev/{self.mock_block_name} -o json"
+        id_ns = {"nsze": 100, "nuse": 10, "flbas": 0, "lbafs": [{"ms": 0, "ds": 9}]}
+        self.update_cmd_map(cmd, json.dumps(id_ns))
+        self.assertEqual(self.nvme.get_size("nsze"), 100)
+        # nuse is read again on every call
+        id_ns["nuse"] = 0
+        self.update_cmd_map(cmd, json.dumps(id_ns))
+        self.assertEqual(self.nvme.get_size("nuse"), 0)
+        # The block size is taken from the last id-ns read
+        self.update_cmd_map(cmd, "")
+        self.assertEqual(self.nvme.get_bs_size(), 512)
+
     @apply_mock
     def test_get_bs_size(self):
         """unit test for get_bs_size"""
-        cmd = f"nvme id-ns /dev/{self.mock_block_name} -H"
-        mock_output_valid = (
-            "LBA Format  0 : Metadata Size: 0   bytes - Data Size"
-            ": 512 bytes - Relative Performance: 0 Best (in use)\n"
-            "LBA Format  1 : Metadata Size: 0   bytes - Data Size: "
-            "4096 bytes - Relative Performance: 0 Best"
-        )
-        mock_output_invalid = (
-            "LBA Format  1 : Metadata Size: 0   bytes - "
-            "Data Size: 4096 bytes - Relative Performance: 0 Best"
+        cmd = f"nvme id-ns /dev/{self.mock_block_name} -o json"
+        mock_output_valid = json.dumps(
+            {
+                "flbas": 0,
+                "lbafs": [{"ms": 0, "ds": 9, "rp": 0}, {"ms": 0, "ds": 12, "rp": 0}],
+            }
         )
+        mock_output_invalid = json.dumps({"flbas": 1, "lbafs": [{"ms": 0, "ds": 12}]})
         bytes_used = 512
         self.update_cmd_map(cmd, mock_output_valid)
         # Assert if the expected bytes in use of drive is returned
@@ -347,52 +413,69 @@ class NvmeDriveUnitTest(unittest.TestCase):
         self.assertEqual(out, bytes_used)
         # Assert if the TestError is raised in case output does not have bytes in use
         self.update_cmd_map(cmd, mock_output_invalid)
+        self.nvme.refresh_id_ns()
         self.assertRaises(TestError, self.nvme.get_bs_size)
 
     @apply_mock
     def test_get_bs_size_list(self):
         """unit test for get_bs_size_list"""
-        cmd = f"nvme id-ns /dev/{self.mock_block_name} -H"
-        mock_output_valid = (
-            "LBA Format  0 : Metadata Size: 0   bytes - Data Size: 512 bytes - "
-            "Relative Performance: 0 Best (in use)\n"
-            "LBA Format  1 : Metadata Size: 0   "
-            "bytes - Data Size: 4096 bytes - Relative Performance: 0 Best"
+        cmd = f"nvme id-ns /dev/{self.mock_block_name} -o json"
+        mock_output_valid = json.dumps(
+            {
+                "flbas": 0,
+                "lbafs": [{"ms": 0, "ds": 9, "rp": 0}, {"ms": 0, "ds": 12, "rp": 0}],
+            }
         )
         bytes_list = [512, 4096]
         self.update_cmd_map(cmd, mock_output_valid)
         # Assert if all the bytes in the output are returned as list
         out = self.nvme.get_bs_size_list()
         self.assertListEqual(out, bytes_list)
-        # Assert if the TestError is raised in case the bytes are not
+        # The same id-ns output is used for the current block size
+        self.assertEqual(self.nvme.get_bs_size(), 512)
+        # Assert if the TestError is raised in case the lba formats are not
         # part of output
-        mock_output_invalid1 = "LBA Format  0 : Metadata Size: 0  "
+        mock_output_invalid1 = json.dumps({"flbas": 0})
         self.update_cmd_map(cmd, mock_output_invalid1)
+        self.nvme.refresh_id_ns()
         self.assertRaises(TestError, self.nvme.get_bs_size_list)
         # Assert if the TestError is raised in case of empty output
         mock_output_invalid2 = ""
         self.update_cmd_map(cmd, mock_output_invalid2)
+        self.nvme.refresh_id_ns()
         self.assertRaises(TestError, self.nvme.get_bs_size_list)
 
     @apply_mock
     def test_get_feature(self):
         """unit test for get_feature"""
+        cmds = []
+        mock_outputs = []
         for feature in self.nvme.FEATURE_IDS:
-            cmd = f"nvme get-feature /dev/{self.mock_block_name} -f {feature} -H"
-            mock_output = (
+            cmds.append(f"nvme get-feature /dev/{self.mock_block_name} -f {feature} -H")
+            mock_outputs.append(
                 f"get-feature:{feature} (Arbitration), Current value:0x3030302\n"
                 "High Priority Weight   (HPW): 4\n"
                 "Medium Priority Weight (MPW): 4\n"
                 "Low Priority Weight    (LPW): 4\n"
                 "Arbitration Burst       (AB): 4"
             )
-            self.update_cmd_map(cmd, mock_output)
+        separator = self.nvme.FEATURE_OUTPUT_SEPARATOR
+        cmd = f" && echo '{separator}' && ".join(cmds)
+        self.update_cmd_map(cmd, f"\n{separator}\n".join(mock_outputs))
         out = self.nvme.get_feature()
         # Asserting if the return type is list
         self.assertIsInstance(out, list)
         # Asserting if the list contains the all Features output
         # by validating the length
         self.assertEqual(len(out), len(self.nvme.FEATURE_IDS))
+        self.assertEqual(
+            out[0],
+            "get-feature:0x1 (Arbitration), Current value:0x3030302,"
+            "High Priority Weight   (HPW): 4,"
+            "Medium Priority Weight (MPW): 4,"
+            "Low Priority Weight    (LPW): 4,"
+            "Arbitration Burst       (AB): 4",
+        )
         # Asserting by passing Feature ID's as input
         mock_feature_ids = ["oxaseer"]
         cmd = f"nvme get-feature /dev/{self.mock_block_name} -f 'oxaseer' -H"
@@ -453,6 +536,13 @@ class NvmeDriveUnitTest(unittest.TestCase):
         out = nvme.calculate_waf(mock_hwrite, mock_nwrite, formula)
         self.assertFalse(out[0])
         self.assertEqual(ZeroDivisionError, out[1].__class__)
+        # The numeric divisor gives the same result as the formula string
+        mock_hwrite = 400.0
+        divisor = {"field": formula["field"], "divisor": pow(1024, 3)}
+        self.assertAlmostEqual(
+            nvme.calculate_waf(mock_hwrite, mock_nwrite, divisor)[0],
+            nvme.calculate_waf(mock_hwrite, mock_nwrite, formula)[0],
+        )
 
     def test_convert_nand_write(self):
         """unit test for convert_nand_write"""
@@ -478,6 +568,10 @@ class NvmeDriveUnitTest(unittest.TestCase):
         # Assert if the
         out = self.nvme.get_drive_name()
         self.assertEqual(out, self.mock_block_name)
+        self.nvme.block_name = "nvme12n1"
+        self.assertEqual(self.nvme.get_drive_name(), "nvme12")
+        self.nvme.block_name = "nvmen1"
+        self.assertRaises(TestError, self.nvme.get_drive_name)
 
     @apply_mock
     @mock.patch.object(json, "dumps")
@@ -557,6 +651,110 @@ class NvmeDriveUnitTest(unittest.TestCase):
             ]
         )
 
+    @apply_mock
+    @mock.patch("autoval_ssd.lib.utils.storage.nvme.nvme_drive.sleep")
+    def test_reset(self, mock_sleep):
+        """unit test for reset"""
+        with patch.object(self.nvme.host, "run", return_value="") as mock_run:
+            self.nvme.reset()
+        mock_sleep.assert_called_once_with(1)
+        # The controller state and namespace are polled on the DUT in a
+        # single command
+        self.assertEqual(
+            mock_run.call_args_list[-1],
+            call(
+                cmd="for _ in $(seq 18); do grep -qx live "
+                "/sys/class/nvme/nvme1/state && test -b /dev/nvme1n1 && break; "
+                "sleep 0.5; done",
+                ignore_status=True,
+            ),
+        )
+        # A dropped connection keeps the fixed wait
+        mock_sleep.reset_mock()
+        with patch.object(
+            self.nvme.host, "run", return_value="dropped connection"
+        ) as mock_run:
+            self.nvme.reset()
+        mock_sleep.assert_called_once_with(15)
+        self.assertEqual(
+            mock_run.call_args_list[-1],
+            call(cmd="nvme reset /dev/nvme1", ignore_status=True),
+        )
+
+    def test_get_fw_download_xfer(self):
+        """unit test for _get_fw_download_xfer"""
+        self.nvme.id_ctrl = {"mdts": 5, "fwug": 0}
+        self.assertEqual(self.nvme._get_fw_download_xfer(), 128 * 1024)
+        self.nvme.id_ctrl = {"mdts": 3, "fwug": 0xFF}
+        self.assertEqual(self.nvme._get_fw_download_xfer(), 32 * 1024)
+        self.nvme.id_ctrl = {"mdts": 0, "fwug": 12}
+        self.assertEqual(self.nvme._get_fw_download_xfer(), 96 * 1024)
+        self.nvme.id_ctrl = {"mdts": 2, "fwug": 8}
+        self.assertEqual(self.nvme._get_fw_download_xfer(), 0)
+        self.nvme.id_ctrl = None
+        self.assertEqual(self.nvme._get_fw_download_xfer(), 0)
+
+    @mock.patch.object(AutovalLog, "log_info")
+    def test_fw_activate(self, mock_log):
+        """unit test for fw_activate"""
+        mock_log.side_effect = self.get_logger
+        with patch.object(
+            self.nvme.host,
+            "run",
+            side_effect=Exception("firmware requires any controller reset"),
+        ):
+            self.log = ""
+            self.nvme.fw_activate("nvme1", "bin/mock loc", 1, 1)
+            self.assertIn("successful, but required reset", self.log)
+        with patch.object(
+            self.nvme.host, "run", side_effect=Exception("Invalid Firmware Image")
+        ):
+            self.log = ""
+            self.nvme.fw_activate("nvme1", "bin/mock loc", 1, 1)
+            self.assertIn("Unknown exception occured: Invalid Firmware Image", self.log)
+        # The nvme list is read again for the activated firmware revision
+        with patch.object(self.nvme.host, "run", return_value=""), patch.object(
+            NVMeUtils, "invalidate_nvme_list"
+        ) as mock_invalidate:
+            self.nvme.fw_activate("nvme1", "bin/mock loc", 1, 3)
+        mock_invalidate.assert_called_once_with(self.nvme.host)
+
+    @mock.patch.object(NVMeDrive, "get_firmware_version")
+    def test_is_lmparser_ocp_2_0_drive(self, mock_fw_version):
+        """unit test for is_lmparser_ocp_2_0_drive"""
+        mock_fw_version.return_value = "80003E00"
+        model = self.nvme.model
+        self.nvme.lmparser_ocp_2_0_drives = {}
+        self.assertFalse(self.nvme.is_lmparser_ocp_2_0_drive())
+        self.nvme.lmparser_ocp_2_0_drives = {"AnyFW": [model]}
+        self.assertTrue(self.nvme.is_lmparser_ocp_2_0_drive())
+        # The firmware version is only read for firmware specific entries
+        mock_fw_version.assert_not_called()
+        self.nvme.lmparser_ocp_2_0_drives = {"AnyFW": [], "80003E00": [model]}
+        self.assertTrue(self.nvme.is_lmparser_ocp_2_0_drive())
+        self.nvme.lmparser_ocp_2_0_drives = {"AnyFW": [], "80003E01": [model]}
+        self.assertFalse(self.nvme.is_lmparser_ocp_2_0_drive())
+        self.assertEqual(mock_fw_version.call_count, 2)
+
+    @mock.patch.object(NVMeDrive, "get_nvme_read")
+    @mock.patch.object(NVMeDrive, "get_nvme_id_ctrl")
+    def test_run_timed_admin_io_commands(self, mock_id_ctrl, mock_read):
+        """unit test for _run_timed_admin_io_commands"""
+        mock_id_ctrl.return_value = "fr : 80003E00"
+        mock_read.return_value = "read: Success"
+        self.nvme._run_timed_admin_io_commands()
+        mock_id_ctrl.assert_called_once_with(grep=None)
+        mock_read.assert_called_once_with()
+        self.assertEqual(self.nvme.admin_command, "fr : 80003E00")
+        self.assertEqual(self.nvme.io_command, "read: Success")
+        self.assertGreaterEqual(
+            self.nvme.admin_command_timer_after, self.nvme.command_timer_before
+        )
+        # The IO timer covers the admin probe as well
+        self.assertGreaterEqual(
+            self.nvme.io_command_timer_after, self.nvme.admin_command_timer_after
+        )
+
     @apply_mock
     @mock.patch.object(NVMeDrive, "get_smart_log")
     def test_collect_data(self, mock_smart_log):
@@ -573,6 +771,7 @@ class NvmeDriveUnitTest(unittest.TestCase):
         self.assertEqual(collect_output["interface"], self.nvme.interface.value)
         self.assertEqual(collect_output["model"], mock_nvme_list.get("ModelNumber"))
         self.assertEqual(collect_output["manufacturer"], "GenericNVMe")
+        self.assertEqual(collect_output["capacity"], self.nvme.get_capacity())
 
     @apply_mock
     def test_get_vs_timestamp(self):
@@ -593,23 +792,43 @@ class NvmeDriveUnitTest(unittest.TestCase):
     @apply_mock
     @mock.patch.object(PciUtils, "get_nvme_drive_pcie_address")
     @mock.patch.object(PciUtils, "get_lspci_output")
-    @mock.patch.object(NVMeDrive, "get_smart_log")
-    def test_drive_health_check(self, mock_smart_log, mock_lspci, mock_drive_pcie):
+    def test_drive_health_check(self, mock_lspci, mock_drive_pcie):
         """unit test for drive_health_check."""
+        cmd = f"nvme smart-log /dev/{self.mock_block_name} -o json"
+        # Restore the shared smart-log mock output for the other tests
+        original = next(each["result"] for each in CMD_MAP if each["cmd"] == cmd)
+        self.addCleanup(self.update_cmd_map, cmd, original)
         mock_lspci.return_value = " Fatal+"
         mock_drive_pcie.return_value = "pass"
-        mock_smart_log.return_value = self.mock_smart_log
+        self.update_cmd_map(cmd, json.dumps(self.mock_smart_log["smart-log"]))
         self.nvme.drive_health_check()
         mock_smart = copy.deepcopy(self.mock_smart_log)
         # Changing the critical warning value to be >0
         mock_smart["smart-log"]["critical_warning"] = 1
-        mock_smart_log.return_value = mock_smart
+        self.update_cmd_map(cmd, json.dumps(mock_smart["smart-log"]))
         self.assertRaises(TestError, self.nvme.drive_health_check)
         # Changing the lscpi output and asserting if the error
         # is raised if Fatal+ pattern is not found
         mock_lspci.return_value = " Fatal-"
         self.assertRaises(TestError, self.nvme.drive_health_check)
 
+    def test_get_smart_log_field(self):
+        """unit test for _get_smart_log_field"""
+        self.nvme.refresh_smart_log()
+        with patch.object(
+            self.nvme.host, "run", return_value='{"critical_warning" : 4}'
+        ) as mock_run:
+            self.assertEqual(self.nvme._get_smart_log_field("critical_warning"), 4)
+            # A missing field fails at once instead of retrying the command
+            self.assertRaises(TestError, self.nvme._get_smart_log_field, "temperature")
+        self.assertEqual(mock_run.call_count, 2)
+        # A fresh smart log read is reused
+        self.nvme._smart_log = {"smart-log": {"critical_warning": 0}}
+        self.nvme._smart_log_time = time.monotonic()
+        self.assertEqual(self.nvme._get_smart_log_field("critical_warning"), 0)
+        self.assertRaises(TestError, self.nvme._get_smart_log_field, "temperature")
+        self.nvme.refresh_smart_log()
+
     @apply_mock
     @mock.patch.object(AutovalLog, "log_info")
     @mock.patch.object(NVMeDrive, "get_smart_log")
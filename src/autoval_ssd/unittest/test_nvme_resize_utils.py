@@ -3,9 +3,13 @@ import unittest
 from unittest import mock
 
 from autoval.lib.utils.autoval_exceptions import TestError
+from autoval.lib.utils.autoval_thread import AutovalThread
 from autoval.lib.utils.autoval_utils import AutovalUtils
 
-from autoval_ssd.lib.utils.storage.nvme.nvme_resize_utils import NvmeResizeUtil
+from autoval_ssd.lib.utils.storage.nvme.nvme_resize_utils import (
+    _SharedNvmeList,
+    NvmeResizeUtil,
+)
 from autoval_ssd.lib.utils.storage.nvme.nvme_utils import NVMeUtils
 
 from autoval_ssd.unittest.mock.lib.mock_host import MockHost
@@ -17,13 +21,20 @@ BYTES_PER_TB = 1000**4
 class NvmeResizeUtilUnitTest(unittest.TestCase):
     def setUp(self) -> None:
         self.mock_host = MockHost(cmd_map=CMD_MAP)
+        self.addCleanup(NvmeResizeUtil.invalidate_cache)
 
     def test_get_flag(self):
         """
         Unittest for get_flag
         """
-        cmd = "nvme id-ns -n 1 /dev/nvme0n1 | grep 'in use'"
-        mock_output_valid = "lbads:12"
+        cmd = "nvme id-ns -n 1 /dev/nvme0n1"
+        # Only the in use lbaf line is parsed
+        mock_output_valid = "\n".join(
+            [
+                "lbaf  0 : ms:0   lbads:9  rp:0",
+                "lbaf  1 : ms:0   lbads:12 rp:0 (in use)",
+            ]
+        )
         self.mock_host.update_cmd_map(cmd, mock_output_valid)
         out = NvmeResizeUtil.get_flag(
             self.mock_host, "nvme0n1", "lbads", r"lbads:(\d+)"
@@ -38,6 +49,71 @@ class NvmeResizeUtilUnitTest(unittest.TestCase):
             str(exp.exception),
         )
 
+    def test_get_inuse_lbaf(self):
+        """
+        Unittest for get_inuse_lbaf
+        """
+        cmd = "nvme id-ns /dev/nvme0 -o json -n 1"
+        lbafs = '[{"ms": 0, "ds": 9, "rp": 0}, {"ms": 0, "ds": 12, "rp": 0}]'
+        self.mock_host.update_cmd_map(cmd, f'{{"flbas": 1, "lbafs": {lbafs}}}')
+        out = NvmeResizeUtil.get_inuse_lbaf(self.mock_host, "nvme0")
+        self.assertEqual(out, (12, 1))
+        # The format index only uses the low nibble and bits 6:5 of flbas
+        self.mock_host.update_cmd_map(cmd, f'{{"flbas": 16, "lbafs": {lbafs}}}')
+        out = NvmeResizeUtil.get_inuse_lbaf(self.mock_host, "nvme0")
+        self.assertEqual(out, (9, 0))
+        self.mock_host.update_cmd_map(cmd, f'{{"flbas": 2, "lbafs": {lbafs}}}')
+        with self.assertRaises(TestError) as exp:
+            NvmeResizeUtil.get_inuse_lbaf(self.mock_host, "nvme0")
+        self.assertEqual(
+            "[AUTOVAL TEST ERROR] Failed to find lbads flag for drive in nvme0",
+            str(exp.exception),
+        )
+        self.mock_host.update_cmd_map(cmd, f'{{"lbafs": {lbafs}}}')
+        with self.assertRaises(TestError) as exp:
+            NvmeResizeUtil.get_inuse_lbaf(self.mock_host, "nvme0")
+        self.assertEqual(
+            "[AUTOVAL TEST ERROR] Failed to find flbas flag for drive in nvme0",
+            str(exp.exception),
+        )
+
+    def test_shared_nvme_list(self):
+        """
+        Unittest for _SharedNvmeList
+        """
+        host = mock.Mock()
+        host.run.return_value = "/dev/nvme0n1"
+        nvme_list = _SharedNvmeList(host)
+        self.assertEqual(nvme_list.get(not_before=0.0), "/dev/nvme0n1")
+        # A run started after the caller's change is reused
+        self.assertEqual(nvme_list.get(not_before=0.0), "/dev/nvme0n1")
+        host.run.assert_called_once_with("nvme list")
+        # A change after the last run needs a new one
+        host.run.return_value = ""
+        self.assertEqual(nvme_list.get(not_before=float("inf")), "")
+        self.assertEqual(host.run.call_count, 2)
+
+    @mock.patch("autoval_ssd.lib.utils.storage.nvme.nvme_resize_utils.time.sleep")
+    def test_wait_for_attached_ns(self, mock_sleep):
+        """
+        Unittest for _wait_for_attached_ns
+        """
+        host = mock.Mock()
+        host.run_get_result.return_value.return_code = 0
+        NvmeResizeUtil._wait_for_attached_ns(host, "nvme1", 1)
+        # A quiet period first, then one sysfs poll loop on the DUT
+        mock_sleep.assert_called_once_with(3)
+        ns_path = "/sys/class/nvme/nvme1/nvme1n1"
+        host.run_get_result.assert_called_once_with(
+            f"for _ in $(seq 14); do test -e {ns_path} && break; "
+            f"sleep 0.5; done; test -e {ns_path}",
+            ignore_status=True,
+        )
+        host.run.assert_not_called()
+        # A namespace that never shows is only logged
+        host.run_get_result.return_value.return_code = 1
+        NvmeResizeUtil._wait_for_attached_ns(host, "nvme1", 1)
+
     @mock.patch.object(NvmeResizeUtil, "get_nvme_with_namespace")
     @mock.patch.object(NVMeUtils, "get_id_ns")
     def test_get_nvmcap(self, mock_get_id_ns, mock_get_nvme):
@@ -49,6 +125,200 @@ class NvmeResizeUtilUnitTest(unittest.TestCase):
         out = NvmeResizeUtil.get_nvmcap(self.mock_host, ["nvme0n1"])
         self.assertEqual(out, [7675106557952])
 
+    @mock.patch.object(NvmeResizeUtil, "get_nvme_with_namespace")
+    @mock.patch.object(NVMeUtils, "get_namespace_support_drive_list")
+    @mock.patch.object(NVMeUtils, "get_id_ns")
+    @mock.patch.object(NVMeUtils, "get_id_ctrl")
+    def test_get_nvme_ctrls(
+        self, mock_get_id_ctrl, mock_get_id_ns, mock_ns_support, mock_get_nvme
+    ):
+        """
+        Unittest for get_nvme_ctrls
+        """
+        mock_ns_support.return_value = ["nvme0n1", "nvme1n1"]
+        mock_get_nvme.return_value = {"nvme0": "nvme0n1", "nvme1": "nvme1n1"}
+        mock_get_id_ctrl.side_effect = lambda host, device: {
+            "tnvmcap": 1000 if device == "nvme0" else 2000
+        }
+        mock_get_id_ns.side_effect = lambda host, device, nsid: {
+            "ncap": len(device),
+            "nsze": nsid,
+        }
+        out = NvmeResizeUtil.get_nvme_ctrls(
+            self.mock_host,
+            ["nvme0n1", "nvme1n1"],
+            nvme_id_ctrl_filter='nvme_id_ctrl["tnvmcap"] > 1500',
+        )
+        self.assertEqual(
+            out, {"nvme1": {"tnvmcap": 2000, "orig_ncap": 5, "orig_nsze": 1}}
+        )
+        out = NvmeResizeUtil.get_nvme_ctrls(self.mock_host, ["nvme0n1", "nvme1n1"])
+        self.assertEqual(list(out), ["nvme0", "nvme1"])
+        # An invalid filter fails before any drive is read
+        mock_get_id_ctrl.reset_mock()
+        with self.assertRaises(TestError):
+            NvmeResizeUtil.get_nvme_ctrls(
+                self.mock_host, ["nvme0n1"], nvme_id_ctrl_filter="nvme_id_ctrl["
+            )
+        mock_get_id_ctrl.assert_not_called()
+
+    @mock.patch.object(NvmeResizeUtil, "get_nvme_with_namespace")
+    @mock.patch.object(NVMeUtils, "get_namespace_support_drive_list")
+    @mock.patch.object(NVMeUtils, "get_id_ns")
+    def test_namespace_drives_cache(
+        self, mock_get_id_ns, mock_ns_support, mock_get_nvme
+    ):
+        """
+        Unittest for the namespace drive lookups shared by get_nvmcap
+        and get_nvme_ctrls
+        """
+        mock_get_id_ns.return_value = {"nvmcap": 100, "ncap": 10, "nsze": 10}
+        mock_ns_support.return_value = ["nvme0n1"]
+        mock_get_nvme.return_value = {"nvme0": ["nvme0n1"]}
+        with mock.patch.object(NVMeUtils, "get_id_ctrl", return_value={}):
+            NvmeResizeUtil.get_nvmcap(self.mock_host, ["nvme0n1"])
+            NvmeResizeUtil.get_nvme_ctrls(self.mock_host, ["nvme0n1"])
+            mock_ns_support.assert_called_once_with(self.mock_host, ["nvme0n1"])
+            mock_get_nvme.assert_called_once_with(self.mock_host, ["nvme0n1"])
+            NvmeResizeUtil.invalidate_cache()
+            NvmeResizeUtil.get_nvme_ctrls(self.mock_host, ["nvme0n1"])
+        self.assertEqual(mock_ns_support.call_count, 2)
+        # Keyed on the hostname and sorted block names, not the objects
+        mock_ns_support.return_value = ["nvme0n1", "nvme1n1"]
+        NvmeResizeUtil._get_namespace_drives(self.mock_host, ["nvme1n1", "nvme0n1"])
+        drives, _ = NvmeResizeUtil._get_namespace_drives(
+            MockHost(cmd_map=CMD_MAP), ["nvme0n1", "nvme1n1"]
+        )
+        self.assertEqual(drives, ["nvme0n1", "nvme1n1"])
+        self.assertEqual(mock_ns_support.call_count, 3)
+
+    def test_get_ns_granularity(self):
+        """
+        Unittest for get_ns_granularity and align_lba_count
+        """
+        self.assertEqual(NvmeResizeUtil.get_ns_granularity({}, 1), (0, 0))
+        granularity = {
+            "attributes": 0,
+            "entry": [{"nszegran": 1 << 20, "ncapgran": 1 << 16}],
+        }
+        nvme_id_ctrl = {"ns_granularity": granularity}
+        self.assertEqual(
+            NvmeResizeUtil.get_ns_granularity(nvme_id_ctrl, 1), (1 << 20, 1 << 16)
+        )
+        # Descriptors per LBA format
+        granularity["attributes"] = 1
+        self.assertEqual(NvmeResizeUtil.get_ns_granularity(nvme_id_ctrl, 1), (0, 0))
+        granularity["entry"].append({"nszegran": 8192, "ncapgran": 4096})
+        self.assertEqual(
+            NvmeResizeUtil.get_ns_granularity(nvme_id_ctrl, 1), (8192, 4096)
+        )
+        self.assertEqual(NvmeResizeUtil.align_lba_count(1000, 1 << 20, 4096), 768)
+        self.assertEqual(NvmeResizeUtil.align_lba_count(1001, 4096, 4096), 1001)
+        self.assertEqual(NvmeResizeUtil.align_lba_count(1001, 0, 512), 1001)
+
+    @mock.patch.object(NVMeUtils, "get_id_ns_granularity")
+    @mock.patch.object(NVMeUtils, "get_id_ns")
+    @mock.patch.object(NVMeUtils, "get_id_ctrl")
+    def test_get_id_ctrl_and_ns(
+        self, mock_get_id_ctrl, mock_get_id_ns, mock_get_granularity
+    ):
+        """
+        Unittest for _get_id_ctrl_and_ns
+        """
+        mock_get_id_ns.return_value = {"nsze": 1}
+        granularity = {"attributes": 0, "entry": [{"nszegran": 8192}]}
+        mock_get_granularity.return_value = granularity
+        # Scenario 1: granularity only read when ctratt reports it
+        mock_get_id_ctrl.side_effect = lambda host, device: {"ctratt": 0}
+        id_ctrl, _ = NvmeResizeUtil._get_id_ctrl_and_ns(self.mock_host, "nvme0")
+        self.assertNotIn("ns_granularity", id_ctrl)
+        mock_get_granularity.assert_not_called()
+        mock_get_id_ctrl.side_effect = lambda host, device: {"ctratt": 1 << 7}
+        id_ctrl, id_ns = NvmeResizeUtil._get_id_ctrl_and_ns(self.mock_host, "nvme0")
+        self.assertEqual(id_ctrl["ns_granularity"], granularity)
+        self.assertEqual(id_ns, {"nsze": 1})
+        # Scenario 2: a failed granularity lookup leaves it out
+        mock_get_granularity.side_effect = Exception("Invalid Command")
+        id_ctrl, _ = NvmeResizeUtil._get_id_ctrl_and_ns(self.mock_host, "nvme0")
+        self.assertEqual(NvmeResizeUtil.get_ns_granularity(id_ctrl, 0), (0, 0))
+
+    def test_get_index_of_closest_capacity(self):
+        """
+        Unittest for get_index_of_closest_capacity
+        """
+        for max_bytes, index in (
+            (0, 0),
+            (int(1.8 * BYTES_PER_TB), 0),
+            (int(2.7 * BYTES_PER_TB), 0),
+            (int(2.7 * BYTES_PER_TB) + 1, 1),
+            (int(7.6 * BYTES_PER_TB), 1),
+        ):
+            self.assertEqual(
+                NvmeResizeUtil.get_index_of_closest_capacity(max_bytes), index
+            )
+
+    def test_get_idema_lba_counts(self):
+        """
+        Unittest for get_idema_lba_counts
+        """
+        self.assertEqual(
+            NvmeResizeUtil.get_idema_lba_counts(50 * 1000**3, 4096), 12212046
+        )
+        self.assertEqual(
+            NvmeResizeUtil.get_idema_lba_counts(100 * 1000**3, 512),
+            97696368 + 1953504 * 50,
+        )
+        # Any other block size uses the 512 byte counts
+        self.assertEqual(
+            NvmeResizeUtil.get_idema_lba_counts(50 * 1000**3, 520), 97696368
+        )
+
+    @mock.patch.object(AutovalThread, "wait_for_autoval_thread")
+    @mock.patch.object(AutovalThread, "start_autoval_thread")
+    @mock.patch.object(NvmeResizeUtil, "get_nvme_ctrls")
+    @mock.patch.object(MockHost, "run")
+    def test_perform_resize(
+        self, mock_run, mock_get_nvme_ctrls, mock_start_thread, mock_wait_thread
+    ):
+        """
+        Unittest for perform_resize
+        """
+        mock_run.return_value = "/dev/nvme0n1"
+        mock_get_nvme_ctrls.return_value = {"nvme0": {}, "nvme1": {}}
+        NvmeResizeUtil.perform_resize(
+            self.mock_host,
+            ["nvme0n1", "nvme1n1"],
+            NvmeResizeUtil.SweepParamKeyEnum.overprovisioning,
+            NvmeResizeUtil.SweepParamUnitEnum.percent,
+            50,
+            cycle=3,
+        )
+        self.assertEqual(mock_start_thread.call_count, 6)
+        self.assertEqual(mock_wait_thread.call_count, 3)
+        # One nvme list before the first cycle and one after each cycle
+        self.assertEqual(mock_run.call_args_list, [mock.call("nvme list")] * 4)
+
+    def test_sweep_param_enums(self):
+        """
+        Unittest for SweepParamKeyEnum and SweepParamUnitEnum conversions
+        """
+        max_bytes = 4 * BYTES_PER_TB
+        key_enum = NvmeResizeUtil.SweepParamKeyEnum
+        unit_enum = NvmeResizeUtil.SweepParamUnitEnum
+        self.assertEqual(len(key_enum), 3)
+        self.assertEqual(len(unit_enum), 3)
+        self.assertEqual(key_enum.usercapacity.to_usercapacity(10, max_bytes), 10)
+        self.assertEqual(
+            key_enum.round_to_usercapacity.to_usercapacity(10, max_bytes),
+            int(3.6 * BYTES_PER_TB),
+        )
+        self.assertEqual(
+            key_enum.overprovisioning.to_usercapacity(10, max_bytes), max_bytes - 10
+        )
+        self.assertEqual(unit_enum.percent.to_bytes(50, max_bytes), max_bytes // 2)
+        self.assertEqual(unit_enum.num_bytes.to_bytes(10, max_bytes), 10)
+        self.assertEqual(unit_enum.num_TB.to_bytes(1.5, max_bytes), 1500 * 1000**3)
+
     def test_validate_num_bytes_less_equal_max_bytes(self):
         """
         Unittest for validate_num_bytes_less_equal_max_bytes
@@ -57,7 +327,7 @@ class NvmeResizeUtilUnitTest(unittest.TestCase):
         num_bytes = int((1.8 * (BYTES_PER_TB)) - 1)
         NvmeResizeUtil.validate_num_bytes_less_equal_max_bytes(num_bytes, max_bytes)
 
-    @mock.patch.object(NvmeResizeUtil, "get_flag")
+    @mock.patch.object(NvmeResizeUtil, "get_inuse_lbaf")
     @mock.patch.object(NVMeUtils, "detach_ns")
     @mock.patch.object(NVMeUtils, "delete_ns")
     @mock.patch.object(NVMeUtils, "create_ns")
@@ -76,7 +346,7 @@ class NvmeResizeUtilUnitTest(unittest.TestCase):
         mock_create_ns,
         mock_delete_ns,
         mock_detach_ns,
-        mock_get_flag,
+        mock_get_inuse_lbaf,
     ) -> None:
         # Postive Case
 
@@ -104,7 +374,7 @@ class NvmeResizeUtilUnitTest(unittest.TestCase):
         }
         mock_sweep_param_unit = NvmeResizeUtil.SweepParamUnitEnum.percent
         mock_sweep_param_key = NvmeResizeUtil.SweepParamKeyEnum.overprovisioning
-        mock_get_flag.return_value = 12
+        mock_get_inuse_lbaf.return_value = (12, 1)
         mock_device = "nvme1"
         mock_sweep_param_value = 50
 
@@ -117,7 +387,7 @@ class NvmeResizeUtilUnitTest(unittest.TestCase):
             mock_sweep_param_value,
         )
 
-        mock_get_flag.assert_called()
+        mock_get_inuse_lbaf.assert_called_once_with(self.mock_host, mock_device)
         mock_detach_ns.assert_called()
         mock_delete_ns.assert_called()
         mock_create_ns.assert_called()
@@ -126,6 +396,37 @@ class NvmeResizeUtilUnitTest(unittest.TestCase):
         mock_get_id_ns.assert_called()
         mock_validate_equal.assert_called()
 
+        # Unsupported lbads
+        mock_get_inuse_lbaf.return_value = (10, 1)
+        with self.assertRaises(TestError) as exp:
+            NvmeResizeUtil.ns_resize(
+                self.mock_host,  # type: ignore
+                mock_nvme_id_ctrls,
+                mock_sweep_param_unit,
+                mock_sweep_param_key,
+                mock_device,
+                mock_sweep_param_value,
+            )
+        self.assertEqual(
+            "[AUTOVAL TEST ERROR] lbads flag received incorrect value: 10",
+            str(exp.exception),
+        )
+
+        # Oversized request fails before the drive is read or touched
+        mock_get_inuse_lbaf.reset_mock()
+        mock_detach_ns.reset_mock()
+        with self.assertRaises(TestError):
+            NvmeResizeUtil.ns_resize(
+                self.mock_host,  # type: ignore
+                mock_nvme_id_ctrls,
+                NvmeResizeUtil.SweepParamUnitEnum.num_TB,
+                NvmeResizeUtil.SweepParamKeyEnum.usercapacity,
+                mock_device,
+                100,
+            )
+        mock_get_inuse_lbaf.assert_not_called()
+        mock_detach_ns.assert_not_called()
+
         # Negative Case
 
         mock_nvme_id_ctrls = {
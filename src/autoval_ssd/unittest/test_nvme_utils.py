@@ -11,6 +11,10 @@ CMD_MAP = [
     {"cmd": "nvme id-ctrl /dev/nvme0n1 -o json", "result": '{"vid": 5197}'},
     {"cmd": "nvme id-ns /dev/nvme0n1 -o json -n 1", "result": '{"nsze" : 123}'},
     {"cmd": "nvme list -o json", "file": "nvme_list.json"},
+    {
+        "cmd": "nvme id-ns-granularity /dev/nvme0 -o json",
+        "result": '{"attributes": 0, "entry": [{"nszegran": 4096, "ncapgran": 4096}]}',
+    },
     {"cmd": "nvme list-ns /dev/nvme0n1", "result": "[   0]:0x1"},
     {
         "cmd": "nvme create-ns -f 0 /dev/nvme0 -s 123 -c 123",
@@ -103,6 +107,12 @@ class NvmeUtilsUnitTest(unittest.TestCase):
             str(exp.exception), r".*delete_ns: missing NSID for char dev nvme0"
         )
 
+    def test_get_id_ns_granularity(self):
+        self.assertDictEqual(
+            NVMeUtils.get_id_ns_granularity(self.host, "nvme0"),
+            {"attributes": 0, "entry": [{"nszegran": 4096, "ncapgran": 4096}]},
+        )
+
     def test_get_vendor_id(self):
         self.assertEqual(NVMeUtils.get_vendor_id(self.host, "nvme0n1"), 5197)
 
@@ -123,6 +133,50 @@ class NvmeUtilsUnitTest(unittest.TestCase):
         ]
         self.assertListEqual(NVMeUtils.get_nvme_list(self.host), device)
 
+    def test_get_nvme_list_cache(self):
+        with patch.object(
+            self.host, "run_get_result", wraps=self.host.run_get_result
+        ) as run_get_result:
+
+            def nvme_list_reads():
+                return [c[0][0] for c in run_get_result.call_args_list].count(
+                    "nvme list -o json"
+                )
+
+            # Scenario 1: repeated reads reuse the cached list
+            devices = NVMeUtils.get_nvme_list(self.host)
+            self.assertListEqual(NVMeUtils.get_nvme_list(self.host), devices)
+            self.assertEqual(
+                NVMeUtils.get_from_nvme_list(self.host, "nvme0n1", "Firmware"), "X123"
+            )
+            self.assertEqual(nvme_list_reads(), 1)
+            # Changing a returned entry leaves the cached list untouched
+            devices[0]["Firmware"] = "changed"
+            self.assertEqual(NVMeUtils.get_nvme_list(self.host)[0]["Firmware"], "X123")
+            # Scenario 2: namespace changes drop the cached list
+            NVMeUtils.create_ns(self.host, "nvme0", 123, 123, 4096, 0)
+            NVMeUtils.get_nvme_list(self.host)
+            self.assertEqual(nvme_list_reads(), 2)
+            NVMeUtils.invalidate_nvme_list(self.host)
+            NVMeUtils.get_nvme_list(self.host)
+            self.assertEqual(nvme_list_reads(), 3)
+            # Scenario 3: the cached list expires after the timeout
+            with patch(
+                "autoval_ssd.lib.utils.storage.nvme.nvme_utils.time.monotonic",
+                return_value=float("inf"),
+            ):
+                NVMeUtils.get_nvme_list(self.host)
+            self.assertEqual(nvme_list_reads(), 4)
+
+    def test_get_nvme_list_entry(self):
+        entry = NVMeUtils.get_nvme_list_entry(self.host, "nvme0n1")
+        self.assertEqual(entry["SerialNumber"], "Sxxxxx")
+        with self.assertRaises(TestError) as exp:
+            NVMeUtils.get_nvme_list_entry(self.host, "nvme1n1")
+        self.assertRegex(
+            str(exp.exception), r".*Unable to find DevicePath for nvme1n1.*"
+        )
+
     def test_get_from_nvme_list(self):
         self.assertEqual(
             NVMeUtils.get_from_nvme_list(self.host, "nvme0n1", "Firmware"), "X123"